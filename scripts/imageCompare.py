@@ -1,17 +1,24 @@
 import os
+import datetime
 import subprocess
 import json
 import hashlib
-import tempfile
+import io
+import functools
 import sqlite3
-import re
+import ntpath
+import html
+import queue
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy as np
+import scipy.fft
+import scipy.sparse
 import pandas as pd
 import imagehash
 from PIL import Image
 import tqdm
-from bs4 import BeautifulSoup
 
 import utils
 
@@ -64,13 +71,87 @@ def getAllImageFilePaths(directories):
     return allImageFilePaths
 
 
-def getExifData(allImageFilePaths, exifDataPath, exifToolPath):
+def _startExifTool(exifToolPath):
+    """
+    Start an ExifTool process in stay-open mode, which executes the commands written to its stdin.
+    """
+    return subprocess.Popen([exifToolPath, '-stay_open', 'True', '-@', '-'],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True, encoding='utf-8')
+
+
+def _executeExifTool(exifToolProcess, arguments):
+    """
+    Execute a command in a stay-open ExifTool process and return its (text) output.
+    """
+    # The arguments are written one per line, '-execute' runs them.
+    # ExifTool signals the end of the output of the command with a '{ready}' line.
+    exifToolProcess.stdin.write('\n'.join(arguments) + '\n-execute\n')
+    exifToolProcess.stdin.flush()
+    outputLines = []
+    while True:
+        line = exifToolProcess.stdout.readline()
+        if not line:
+            raise RuntimeError('ExifTool stopped unexpectedly')
+        if line.rstrip() == '{ready}':
+            return ''.join(outputLines)
+        outputLines.append(line)
+
+
+def _stopExifTool(exifToolProcess):
+    """
+    Stop a stay-open ExifTool process.
+    """
+    try:
+        exifToolProcess.stdin.write('-stay_open\nFalse\n')
+        exifToolProcess.stdin.close()
+        exifToolProcess.wait(timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        exifToolProcess.kill()
+
+
+def _getExifRecords(filePaths, exifToolProcess, relevantFields):
+    """
+    Extract the relevant Exif fields of a batch of image files with a stay-open ExifTool process.
+
+    Returns a list with, per file, a tuple of the extracted fields (a dict) and None, or
+    an empty dict and the error message when the extraction fails for that file.
+    """
+    # Only the relevant fields are requested. '-fast2' skips the maker notes and '-n' returns raw
+    # numeric values, so FileSize is given in bytes instead of a formatted string like '4.2 MB'.
+    arguments = ['-charset', 'filename=utf8', '-fast2', '-n', '-json'] +\
+                [f'-{field}' for field in relevantFields] + list(filePaths)
+    try:
+        output = _executeExifTool(exifToolProcess, arguments)
+
+        # Parse the JSON output, it holds one object per file that could be read.
+        jsonResults = json.loads(output) if output.strip() else []
+    except Exception as e:
+        return [({}, f"Error processing {filePath}: {e}") for filePath in filePaths]
+
+    # ExifTool reports the paths with forward slashes, so they are matched on their normalized form.
+    jsonResultsByPath = {os.path.normcase(os.path.normpath(jsonResult.get('SourceFile', ''))): jsonResult
+                         for jsonResult in jsonResults}
+    records = []
+    for filePath in filePaths:
+        jsonResult = jsonResultsByPath.get(os.path.normcase(os.path.normpath(filePath)))
+        if jsonResult is None:
+            records.append(({}, f"Error processing {filePath}: no metadata returned by ExifTool"))
+            continue
+        extractedData = {k: v for k, v in jsonResult.items() if k in relevantFields}
+        extractedData['filePath'] = filePath
+        records.append((extractedData, None))
+    return records
+
+
+def getExifData(allImageFilePaths, exifDataPath, exifToolPath, batchSize=500):
     """
     Extract Exif metadata from a list of image files using ExifTool.
 
-    For each image file provided, this function calls the ExifTool executable
-    via subprocess, requesting metadata in JSON format. Only a predefined set 
-    of relevant fields (e.g., resolution, dimensions, file size) is kept. The 
+    The image files are passed in batches to stay-open ExifTool processes, which
+    are driven via subprocess from a pool of threads, requesting metadata in JSON format. Only a predefined set 
+    of relevant fields (e.g., resolution, dimensions, file size) is requested,
+    as raw numeric values, so FileSize is reported in bytes. The 
     extracted metadata is stored in a pandas DataFrame and also saved to a CSV file.
 
     Parameters
@@ -81,6 +162,8 @@ def getExifData(allImageFilePaths, exifDataPath, exifToolPath):
         Path to save the resulting CSV file containing extracted Exif metadata.
     exifToolPath : str
         Path to the ExifTool executable.
+    batchSize : int, optional
+        Maximum number of files passed to a single ExifTool command. Default is 500.
 
     Returns
     -------
@@ -104,30 +187,59 @@ def getExifData(allImageFilePaths, exifDataPath, exifToolPath):
     # Specifying the fields to extract 
     relevantFields = ["FileSize", "XResolution", "YResolution", "ImageWidth", "ImageHeight"]
    
-    # Initialize the exifData DataFrame
     exifDataColumns = ['filePath'] + relevantFields
-    exifData = pd.DataFrame(columns=exifDataColumns, index=range(len(allImageFilePaths)))
-
-    # Obtain the Exif metadata from each of the files in the list of paths.
+    exifRecords = []
+
+    # Obtain the Exif metadata from the files in the list of paths, in batches of files per
+    # ExifTool command. The batches are smaller for small sets of files, so every thread
+    # still gets a batch.
+    # The commands are executed from a pool of threads, which only wait for ExifTool, so several
+    # batches are processed at the same time. Each thread reuses a stay-open ExifTool process,
+    # so ExifTool is only started once per thread instead of once per batch.
+    # executor.map preserves the input order, so the rows stay aligned with allImageFilePaths.
     print()
-    for i in tqdm.tqdm(range(len(allImageFilePaths)), desc='[START] Extracting exif metadata', bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
-    ncols=80, 
-    ascii=" ░▒▓█"):
-        command = [exifToolPath, '-json', allImageFilePaths[i]]
+    workers = os.cpu_count() or 1
+    batchSize = max(1, min(batchSize, -(-len(allImageFilePaths) // workers)))
+    batches = [allImageFilePaths[start:start + batchSize] for start in range(0, len(allImageFilePaths), batchSize)]
+
+    idleExifToolProcesses = queue.SimpleQueue()
+    startedExifToolProcesses = []
+
+    def extractRecords(batch):
         try:
-            # Subprocess allows programs to run through the command-line-interface and capture its output
-            # Has to be optimized so only the relevant fields are extracted by the exifTool itself.
-            result = subprocess.run(command, capture_output=True, text=True)
-           
-            # Parse the JSON output.
-            jsonResult = json.loads(result.stdout)[0]
-            extractedData = {k: v for k, v in jsonResult.items() if k in relevantFields}
-            extractedData['filePath'] = allImageFilePaths[i]
-            for key, value in extractedData.items():
-                exifData.loc[i, key] = value
-        # When the process fails we print an error messagege               
-        except Exception as e:
-            print(f"Error processing {allImageFilePaths[i]}: {e}")
+            exifToolProcess = idleExifToolProcesses.get_nowait()
+        except queue.Empty:
+            try:
+                exifToolProcess = _startExifTool(exifToolPath)
+            except OSError as e:
+                return [({}, f"Error processing {filePath}: {e}") for filePath in batch]
+            startedExifToolProcesses.append(exifToolProcess)
+        batchRecords = _getExifRecords(batch, exifToolProcess, relevantFields)
+        # A process that stopped is not reused, the next batch starts a new one.
+        if exifToolProcess.poll() is None:
+            idleExifToolProcesses.put(exifToolProcess)
+        return batchRecords
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+             tqdm.tqdm(total=len(allImageFilePaths),
+                       desc='[START] Extracting exif metadata',
+                       bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}",
+                       ncols=80,
+                       ascii=" ░▒▓█") as progressBar:
+            for batchRecords in executor.map(extractRecords, batches):
+                for extractedData, errorMessage in batchRecords:
+                    # When the extraction fails we print an error message, the row of that file stays empty.
+                    if errorMessage is not None:
+                        tqdm.tqdm.write(errorMessage)
+                    exifRecords.append(extractedData)
+                progressBar.update(len(batchRecords))
+    finally:
+        for exifToolProcess in startedExifToolProcesses:
+            _stopExifTool(exifToolProcess)
+
+    # Initialize the exifData DataFrame from the extracted records, keeping the values as returned by ExifTool.
+    exifData = pd.DataFrame(exifRecords, columns=exifDataColumns, index=range(len(allImageFilePaths)), dtype=object)
 
     print('[√] exif metadata extracted succesfully!')
     # Saving the exifData DataFrame to a CSV file.\
@@ -163,7 +275,7 @@ def getConversionNames(maisFlexisRecords, tablesPath, pathToConversionNames):
         DataFrame containing the cleaned and transformed MaisFlexis records.
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
 
     connection.commit()
     print()
@@ -173,96 +285,383 @@ def getConversionNames(maisFlexisRecords, tablesPath, pathToConversionNames):
     ascii=" ░▒▓█")
     
     # Reading the raw records data file into a pandas DataFrame
-    recordsDF = pd.read_excel(maisFlexisRecords)
+    recordsDF = utils.readExcel(maisFlexisRecords, dtype={'NUMMER': 'Int64'})
     
-    # Function to remove HTML tags and replace them with ', '
-    def removeHtmlTags(text):
-        if not isinstance(text, str):
-            return text  # Return as-is if not string
+    # Function to remove HTML tags from a column and replace them with ', '.
+    # The cleaning runs as vectorized string operations on the whole column
+    # instead of calling a Python function for every cell.
+    def removeHtmlTags(column):
+        column = column.fillna('')
+        # Purely numeric columns contain no HTML and are returned as-is
+        if not (column.dtype == object or pd.api.types.is_string_dtype(column.dtype)):
+            return column
 
         # Replace <br> and variants with comma
-        text = re.sub(r'<br\s*/?>', ', ', text, flags=re.IGNORECASE)
+        text = column.str.replace(r'<br\s*/?>', ', ', regex=True, case=False)
 
-        # Parse with BeautifulSoup to remove all other HTML tags properly
-        soup = BeautifulSoup(text, "html.parser")
+        # Replace all other HTML tags with a comma, so text in separate tags stays separated
+        text = text.str.replace(r'<[^>]+>', ', ', regex=True)
 
-        # Get text content (tags stripped)
-        clean_text = soup.get_text(separator=', ')
+        # Decode HTML entities (e.g. &amp;), only for the cells that contain one
+        hasEntities = text.str.contains('&', regex=False, na=False)
+        text[hasEntities] = text[hasEntities].map(html.unescape)
 
         # Clean up multiple commas/spaces
-        clean_text = re.sub(r'\s*,\s*', ', ', clean_text)  # Normalize commas with spaces
-        clean_text = re.sub(r',(,)+', ', ', clean_text)     # Remove duplicate commas
-        clean_text = re.sub(r'\s+', ' ', clean_text)        # Replace multiple spaces with one
-        clean_text = clean_text.strip(' ,')                  # Strip trailing commas/spaces
+        text = text.str.replace(r'(?:\s*,\s*)+', ', ', regex=True)   # Normalize and merge commas
+        text = text.str.replace(r'\s+', ' ', regex=True)              # Replace multiple spaces with one
+        text = text.str.strip(' ,')                                   # Strip trailing commas/spaces
 
-        return clean_text
+        # Values that are not strings are returned as-is
+        return text.where(text.notna(), column)
     
-    # Apply the transformation with a single progress bar
-    # Replacing applymap with progress_apply for better performance
-    recordsDF[['AANVRAAGNUMMER', 'FOTONUMMER', 'NUMMERING_CONVERSIE']] =\
-    recordsDF[['AANVRAAGNUMMER', 'FOTONUMMER', 'NUMMERING_CONVERSIE']].fillna('').map(removeHtmlTags)
+    # Apply the transformation to each of the text columns
+    for column in ['AANVRAAGNUMMER', 'FOTONUMMER', 'NUMMERING_CONVERSIE']:
+        recordsDF[column] = removeHtmlTags(recordsDF[column])
         
     recordsDF = recordsDF.dropna(subset=['NUMMER'])
-    recordsDF['NUMMER'] = recordsDF['NUMMER'].astype(int)
     
     print('[√] MaisFlexis records parsed succesfully')
     recordsDF.to_csv(pathToConversionNames, index=False)
-    recordsDF.to_sql('conversionNames', con=connection, 
-                       if_exists='replace', index=False)
+    bulkReplaceTable(connection, 'conversionNames', recordsDF)
     
     connection.close()
 
     return recordsDF
 
 
-def getImageHash(filePath, algorithm='average_hash'):
+def _fastAverageHash(image, hashSize=8):
     """
-    Calculate an image hash to help identify visually similar images.
+    Calculate the average hash (aHash) of an image with NumPy.
 
-    Supported algorithms:
-    - 'average_hash'
-    - 'phash'
+    Follows the same steps as `imagehash.average_hash` (grayscale, Lanczos resize,
+    threshold against the mean), but packs the bits with `np.packbits` instead of
+    building the hexadecimal string bit by bit in Python. The output is identical
+    to `str(imagehash.average_hash(image))`.
 
     Parameters
     ----------
-    filePath : str
-        Path to the image file to be hashed.
-    algorithm : str, optional
-        Hashing algorithm to use. Default is 'average_hash'.
+    image : PIL.Image.Image
+        The opened image to be hashed.
+    hashSize : int, optional
+        Width and height of the hash grid. Default is 8, which gives a 64-bit hash.
 
     Returns
     -------
-    list
-        A list containing the computed image hash (hexadecimal string).
+    str
+        The computed image hash as a hexadecimal string.
+    """
+    pixels = np.asarray(image.convert('L').resize((hashSize, hashSize), Image.Resampling.LANCZOS), dtype=np.uint8)
+    bits = pixels > pixels.mean()
+    return np.packbits(bits.reshape(-1)).tobytes().hex()
+
+
+def _getHashIntermediate(filePath):
+    """
+    Decode an image into the 32x32 grayscale intermediate used for image hashing.
+
+    For JPEG files, `Image.draft` lets the decoder scale the image down while decoding
+    (DCT scaling), which is much faster than decoding at full resolution and resizing
+    afterwards.
+
+    Parameters
+    ----------
+    filePath : str or file-like object
+        Path to the image file, or the image file contents opened in memory.
+
+    Returns
+    -------
+    PIL.Image.Image
+        The 32x32 grayscale image.
     """
     Image.MAX_IMAGE_PIXELS = None 
+    img = Image.open(filePath)
+    # Only has an effect for JPEG files; the result is at least 64x64 pixels.
+    img.draft('L', (64, 64))
+    return img.convert('L').resize((32, 32), Image.Resampling.LANCZOS)
+
+
+def getImageHashes(filePath, algorithms=('average_hash', 'phash'), fastHash=True):
+    """
+    Calculate one or more image hashes from a single decode of the image.
+
+    The image is opened once and reduced to one shared 32x32 grayscale intermediate
+    (see `_getHashIntermediate`), from which all requested hashes are calculated:
+    - 'phash' uses the 32x32 intermediate directly.
+    - 'average_hash' downsamples the intermediate further to 8x8.
+
+    Parameters
+    ----------
+    filePath : str or file-like object
+        Path to the image file to be hashed, or the image file contents opened in memory.
+    algorithms : tuple of str, optional
+        Hashing algorithms to use. Default is ('average_hash', 'phash').
+    fastHash : bool, optional
+        If True, the NumPy implementation (`_fastAverageHash`) is used for
+        'average_hash', falling back to ImageHash when it fails. Default is True.
+
+    Returns
+    -------
+    dict of str
+        The computed image hash (hexadecimal string) per algorithm. If the image
+        cannot be processed, an error message is returned for each algorithm instead.
+    """
     # Dictionary of possible filehash functions.
     hashFuncs = {'average_hash': imagehash.average_hash,
                   'phash': imagehash.phash}
+    # Dictionary of the faster NumPy implementations, used when fastHash is set.
+    fastHashFuncs = {'average_hash': _fastAverageHash}
     
     # Error message when an unsupported hash function is selected.
-    if algorithm not in hashFuncs:
-        raise ValueError(f"Unsupported algorithm: {algorithm}")
+    for algorithm in algorithms:
+        if algorithm not in hashFuncs:
+            raise ValueError(f"Unsupported algorithm: {algorithm}")
 
-    # Calculating the hash function passed as algorithm argument.
+    # Calculating the hash functions passed as algorithms argument.
     try:
-        img = Image.open(filePath)
-        imageHash = str(hashFuncs.get(algorithm)(img))
-        #print(f'{algorithm} is: {imageHash}')
-        return imageHash
-    # If it fails, an error message is printed.
+        intermediate = _getHashIntermediate(filePath)
+
+        imageHashes = {}
+        for algorithm in algorithms:
+            if fastHash and algorithm in fastHashFuncs:
+                try:
+                    imageHashes[algorithm] = fastHashFuncs.get(algorithm)(intermediate)
+                    continue
+                # If the fast path fails, the ImageHash implementation below is used instead.
+                except Exception:
+                    pass
+            imageHashes[algorithm] = str(hashFuncs.get(algorithm)(intermediate))
+        return imageHashes
+    # If it fails, an error message is returned for each algorithm.
     except Exception as e:
-        return(f"Error generating image hash for {filePath}: {e}")
+        return {algorithm: f"Error generating image hash for {filePath}: {e}" for algorithm in algorithms}
+
+
+def getPerceptualHashes(filePaths, batchSize=4096, inlineThreshold=64):
+    """
+    Calculate the perceptual hash (pHash) of many images with one batched DCT.
+
+    Every image is decoded into the same 32x32 grayscale intermediate as used by
+    `getImageHashes`, in a pool of threads. The intermediates are stacked into one array,
+    and the 2D DCT of a whole batch is calculated with a single multithreaded
+    `scipy.fft.dctn` call, instead of one `imagehash.phash` call per image. As in ImageHash, the 8x8 lowest
+    frequencies are compared against their median, so the output is identical to
+    `str(imagehash.phash(...))`.
+
+    Parameters
+    ----------
+    filePaths : list of str
+        Paths to the image files to be hashed.
+    batchSize : int, optional
+        Number of images transformed per DCT call. Default is 4096.
+    inlineThreshold : int, optional
+        Below this number of images, they are decoded in the calling thread, since starting
+        a thread pool costs more than it saves for a few images. Default is 64.
+
+    Returns
+    -------
+    list of str
+        The pHash (hexadecimal string) per file, in the same order as `filePaths`.
+        If an image cannot be processed, an error message is returned for that file instead.
+    """
+    # The intermediates are kept as uint8, they are converted to floats per batch.
+    pixels = np.zeros((len(filePaths), 32, 32), dtype=np.uint8)
+    pHashes = [None] * len(filePaths)
+
+    # Decoding an image into its intermediate, or the error message if it fails.
+    def loadIntermediate(filePath):
+        try:
+            return np.asarray(_getHashIntermediate(filePath)), None
+        except Exception as e:
+            return None, f"Error generating image hash for {filePath}: {e}"
+
+    # Pillow releases the GIL while decoding and resizing, so larger sets are decoded in threads.
+    # Both map and executor.map preserve the input order, so the results stay aligned with filePaths.
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        mapFunction = map if len(filePaths) < inlineThreshold else executor.map
+        for i, (intermediate, errorMessage) in enumerate(tqdm.tqdm(mapFunction(loadIntermediate, filePaths),
+                                                                   total=len(filePaths),
+                                                                   desc=' * [START] Calculating pHashes',
+                                                                   bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}",
+                                                                   ncols=80,
+                                                                   ascii=" ░▒▓█")):
+            # If it fails, the error message is stored instead of the hash.
+            if errorMessage is not None:
+                pHashes[i] = errorMessage
+            else:
+                pixels[i] = intermediate
+
+    for start in range(0, len(filePaths), batchSize):
+        batch = pixels[start:start + batchSize].astype(np.float64)
+        # Unnormalized type II DCT over both image axes, as in imagehash.phash.
+        dct = scipy.fft.dctn(batch, type=2, axes=(1, 2), workers=-1)
+        lowFrequencies = dct[:, :8, :8].reshape(len(batch), 64)
+        bits = lowFrequencies > np.median(lowFrequencies, axis=1, keepdims=True)
+        packedBits = np.packbits(bits, axis=1)
+
+        for j in range(len(batch)):
+            if pHashes[start + j] is None:
+                pHashes[start + j] = packedBits[j].tobytes().hex()
+
+    return pHashes
+
+
+def getImageHash(filePath, algorithm='average_hash', fastHash=True):
+    """
+    Calculate an image hash to help identify visually similar images.
+
+    Supported algorithms:
+    - 'average_hash'
+    - 'phash'
+
+    The hash is calculated with `getImageHashes`, so all hashes of the same
+    algorithm are calculated the same way.
+
+    Parameters
+    ----------
+    filePath : str or file-like object
+        Path to the image file to be hashed, or the image file contents opened in memory.
+    algorithm : str, optional
+        Hashing algorithm to use. Default is 'average_hash'.
+    fastHash : bool, optional
+        If True, the NumPy implementation (`_fastAverageHash`) is used for
+        'average_hash', falling back to ImageHash when it fails. Default is True.
+
+    Returns
+    -------
+    str
+        The computed image hash (hexadecimal string), or an error message if
+        the image cannot be processed.
+    """
+    return getImageHashes(filePath, algorithms=(algorithm,), fastHash=fastHash)[algorithm]
+
+
+def _getStripCommand(filePath, exifToolPath):
+    """
+    Return the ExifTool command that writes a metadata-stripped copy of a file to stdout.
+
+    Parameters
+    ----------
+    filePath : str
+        Path to the file to be stripped.
+    exifToolPath : str
+        Path to the ExifTool executable.
+
+    Returns
+    -------
+    list of str
+        The command, to be passed to `subprocess`.
+    """
+    # '-all=' removes all metadata, '-o -' writes the output file to stdout.
+    return [exifToolPath, '-all=', '-o', '-', filePath]
+
+
+def _checkStripResult(returncode, error):
+    """
+    Raise an exception when ExifTool failed to strip a file.
+
+    Parameters
+    ----------
+    returncode : int
+        The exit code of the ExifTool process.
+    error : bytes
+        What ExifTool wrote to its standard error.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    Exception
+        If the exit code is not 0.
+    """
+    if returncode != 0:
+        raise Exception(f"ExifTool Error: {error.decode().strip()}")
+
+
+def _getStrippedFileBytes(filePath, exifToolPath):
+    """
+    Return the contents of a file after removing its metadata with ExifTool.
+
+    ExifTool writes the metadata-stripped copy of the file to its standard
+    output, which is read straight from the pipe so no temporary file is needed.
+
+    Parameters
+    ----------
+    filePath : str
+        Path to the file to be stripped.
+    exifToolPath : str
+        Path to the ExifTool executable.
+
+    Returns
+    -------
+    bytes
+        The file contents without metadata.
+
+    Raises
+    ------
+    Exception
+        If ExifTool fails to process the file.
+    """
+    # Subprocess allows programs to run through the command-line-interface and capture its output.
+    process = subprocess.run(args=_getStripCommand(filePath, exifToolPath),
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    _checkStripResult(process.returncode, process.stderr)
+    return process.stdout
+
+
+def _getStrippedFileHash(filePath, exifToolPath, algorithm):
+    """
+    Calculate the hash of a single file after removing its metadata with ExifTool.
+
+    The metadata-stripped output of ExifTool is read from its standard output in
+    chunks of 1 MiB and fed to the hash function as it arrives, so the stripped
+    file is never held in memory completely. Standard error goes to a temporary
+    file, so ExifTool cannot block on a full stderr pipe while stdout is being read.
+    Defined at module level so it can be
+    pickled and run in the worker processes started by `getFileHash`.
+
+    Parameters
+    ----------
+    filePath : str
+        Path to the file to be hashed.
+    exifToolPath : str
+        Path to the ExifTool executable.
+    algorithm : str
+        Name of the `hashlib` hash function to use, e.g. 'md5' or 'sha256'.
+
+    Returns
+    -------
+    tuple of (str, str or None)
+        The hash in hexadecimal format and None, or an error message in both
+        places if the file could not be processed.
+    """
+    try:
+        fileHash = hashlib.new(algorithm)
+        with tempfile.TemporaryFile() as errorFile:
+            with subprocess.Popen(args=_getStripCommand(filePath, exifToolPath),
+                                  stdout=subprocess.PIPE, stderr=errorFile) as process:
+                for chunk in iter(lambda: process.stdout.read(1 << 20), b''):
+                    fileHash.update(chunk)
+            errorFile.seek(0)
+            _checkStripResult(process.returncode, errorFile.read())
+        return fileHash.hexdigest(), None
+
+    # When the process fails, the error message is returned instead.
+    except Exception as e:
+        errorMessage = f"Error processing {filePath}: {e}"
+        return errorMessage, errorMessage
 
 
 def getFileHash(filePaths, exifToolPath, algorithm='md5'):
     """
     Calculate file hashes for duplicate detection after removing metadata.
 
-    Each file is processed by ExifTool to create a temporary, metadata-stripped
-    copy. The hash of this stripped file is then calculated using the specified
-    algorithm. This ensures that only file content (not metadata differences)
-    influences the hash value.
+    Each file is processed by ExifTool to create a metadata-stripped copy. The
+    hash of this stripped copy is then calculated using the specified algorithm.
+    This ensures that only file content (not metadata differences) influences
+    the hash value. The files are processed in parallel across all available
+    CPU cores.
 
     Supported algorithms:
     - 'md5'
@@ -285,64 +684,71 @@ def getFileHash(filePaths, exifToolPath, algorithm='md5'):
         in place of its hash.
     """
     hashList = []
-    # Dictionary of possible file hash functions.
-    hashFuncs = {'md5': hashlib.md5,
-                  'sha256': hashlib.sha256}
     
     # Error message when an unsupported hash function is selected.
-    if algorithm not in hashFuncs:
+    if algorithm not in ('md5', 'sha256'):
         raise ValueError(f"Unsupported algorithm: {algorithm}")
     
     # Calculate the hashes for each of the files in the list of paths.
+    # executor.map preserves the input order, so the results stay aligned with filePaths.
     print()
-    for filePath in tqdm.tqdm(filePaths, desc=f'[START] Calculating {algorithm} hashes', bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
-    ncols=80, 
-    ascii=" ░▒▓█"):
-        try:
-            # Create a temporary file.
-            tempFile = tempfile.NamedTemporaryFile(delete=False)
-            tempPath = tempFile.name
-            tempFile.close()
-
-            # Ensure the tempPath is deleted if it exists.
-            if os.path.exists(tempPath):
-                os.remove(tempPath)
-
-            # The command to be used to run the locally installed ExifTool.
-            command = [exifToolPath, '-all=', '-o', tempPath, filePath]
-            # Subprocess allows programs to run through the command-line-interface and capture its output.
-            process = subprocess.Popen(args=command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            _, error = process.communicate()
-
-            # When the process fails, an exception is raised.
-            if process.returncode != 0:
-                raise Exception(f"ExifTool Error: {error.decode().strip()}")
-
-            # From the dictionary of possible hash functions, the name of the hash function of the specified algorithm 
-            # argument is obtained and used to calculate the hash of that specific function.
-            with open(tempPath, "rb") as f:
-                fileHash = hashFuncs.get(algorithm)(f.read()).hexdigest()
-                hashList.append(fileHash)
-                #print(f"{algorithm} hash is {file_hash}")
-
-        # When the process fails we execute the following steps:
-        except Exception as e:
-            # Show the error message
-            errorMessage = f"Error processing {filePath}: {e}"
-            print(errorMessage)
-            # Add to hashList to match the length of the pandas DataFrame.
-            hashList.append(errorMessage)
-            continue
-        
-        # To ensure the tempPath is always removed before the next iteration in the loop
-        # we put it in the finally block.
-        finally:
-            if os.path.exists(tempPath):
-                os.remove(tempPath)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for fileHash, errorMessage in tqdm.tqdm(executor.map(functools.partial(_getStrippedFileHash,
+                                                                               exifToolPath=exifToolPath,
+                                                                               algorithm=algorithm),
+                                                             filePaths, chunksize=4),
+                                                total=len(filePaths),
+                                                desc=f'[START] Calculating {algorithm} hashes',
+                                                bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
+                                                ncols=80, 
+                                                ascii=" ░▒▓█"):
+            # Errors are shown and added to hashList to match the length of the pandas DataFrame.
+            if errorMessage is not None:
+                tqdm.tqdm.write(errorMessage)
+            hashList.append(fileHash)
     print(f'[√] Calculated {algorithm} hashes succesfully!')
     return hashList
 
 
+def _getInitialHashes(filePath, exifToolPath):
+    """
+    Calculate the MD5 hash and the average hash (aHash) of a single image file.
+
+    The MD5 hash is calculated over the metadata-stripped contents of the file.
+    The aHash is calculated from the same stripped contents, which are already in
+    memory, so each file is read from disk only once. Defined at module level so
+    it can be pickled and run in the worker processes started by `getInitialHashData`.
+
+    Parameters
+    ----------
+    filePath : str
+        Path to the image file to be hashed.
+    exifToolPath : str
+        Path to the ExifTool executable.
+
+    Returns
+    -------
+    tuple
+        A tuple of (md5Hash, aHash, filePath, errorMessage). If a hash cannot be
+        calculated, an error message string is returned in its place and as
+        errorMessage, which is None otherwise. Errors are returned rather than
+        printed, so the parent process can report them without breaking the
+        progress bar.
+    """
+    errorMessage = None
+    try:
+        strippedFileBytes = _getStrippedFileBytes(filePath, exifToolPath)
+        md5Hash = hashlib.md5(strippedFileBytes).hexdigest()
+        imageSource = io.BytesIO(strippedFileBytes)
+    # When stripping fails, the aHash is still calculated from the original file.
+    except Exception as e:
+        md5Hash = errorMessage = f"Error processing {filePath}: {e}"
+        imageSource = filePath
+
+    aHash = getImageHash(imageSource, algorithm='average_hash')
+    return md5Hash, aHash, filePath, errorMessage
+
+
 def getInitialHashData(allImageFilePaths, hashPath, exifToolPath):
     """
     Generate initial hash data (MD5 and average hash) for a collection of image files.
@@ -351,6 +757,9 @@ def getInitialHashData(allImageFilePaths, hashPath, exifToolPath):
     - An MD5 hash (based on a metadata-stripped copy, using ExifTool)
     - An average perceptual hash (aHash), useful for detecting visually similar images
 
+    Both hashes are calculated in a single pass over each file, and the files are
+    processed in parallel across all available CPU cores.
+
     The resulting data is stored in a pandas DataFrame with the following columns:
     - 'md5Hash': MD5 hashes of the files
     - 'aHash': average perceptual image hashes
@@ -372,25 +781,191 @@ def getInitialHashData(allImageFilePaths, hashPath, exifToolPath):
     pandas.DataFrame
         A DataFrame containing the initial hash data for all input files.
     """
-    # Initializing the intial hashes pandas DataFrame.
-    hashData = pd.DataFrame(index=range(len(allImageFilePaths)))
-    
-    # Assigning the values to the pandas DataFrame as lists.
-    hashData['md5Hash'] = getFileHash(allImageFilePaths, exifToolPath, algorithm='md5')
     algorithm='average_hash'
-  
-    hashData['aHash'] = [getImageHash(path, algorithm='average_hash') for path in
-                         tqdm.tqdm(allImageFilePaths, desc=f'[START] Calculating {algorithm} hashes',\
-                         bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
-                         ncols=80, ascii=" ░▒▓█")]
-    
-    hashData['filePath'] = allImageFilePaths
-    print(f'[√] {algorithm}es calculated succesfully!')
+    initialHashes = []
+
+    # Calculating the md5Hash and aHash of each file in a single worker call.
+    # executor.map preserves the input order, so the rows stay aligned with allImageFilePaths.
+    print()
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for *row, errorMessage in tqdm.tqdm(executor.map(functools.partial(_getInitialHashes, exifToolPath=exifToolPath),
+                                          allImageFilePaths, chunksize=4),
+                             total=len(allImageFilePaths),
+                             desc=f'[START] Calculating md5 and {algorithm} hashes',
+                             bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
+                             ncols=80, ascii=" ░▒▓█"):
+            if errorMessage:
+                tqdm.tqdm.write(errorMessage)
+            initialHashes.append(row)
+
+    # Building the pandas DataFrame from the collected rows in one shot.
+    hashData = pd.DataFrame(initialHashes, columns=['md5Hash', 'aHash', 'filePath'])
+    print(f'[√] md5 and {algorithm} hashes calculated succesfully!')
     # Saving the pandas DataFrame as CSV file.
     hashData.to_csv(hashPath, index=False)
     return hashData
 
 
+def _getFileName(filePath):
+    """
+    Return the file name of a Windows or POSIX path, for use as a SQLite function.
+
+    Parameters
+    ----------
+    filePath : str or None
+        Path to the file.
+
+    Returns
+    -------
+    str or None
+        The file name, or None if filePath is NULL.
+    """
+    if filePath is None:
+        return None
+    return ntpath.basename(filePath)
+
+
+def connectToDatabase(tablesPath):
+    """
+    Open a connection to the SQLite database, tuned for bulk loading.
+
+    The default SQLite settings (synchronous=FULL, journal_mode=DELETE) fsync on
+    every commit. Using write-ahead logging with synchronous=NORMAL removes most
+    of these fsyncs, while temporary tables, a larger page cache and memory-mapped
+    reads keep the analysis queries in memory where possible. New databases are
+    created with 8 KiB pages, which suits the long file path and hash rows. The SQL
+    function `basename(filePath)` is registered on the connection.
+
+    Parameters
+    ----------
+    tablesPath : str
+        Path to the SQLite database file.
+
+    Returns
+    -------
+    sqlite3.Connection
+        An open connection to the database.
+    """
+    connection = sqlite3.connect(database=tablesPath)
+    # The page size only applies to a new database, so it is set before switching to WAL.
+    connection.executescript("""
+    PRAGMA page_size = 8192;
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -262144;
+    PRAGMA mmap_size = 30000000000;
+    """)
+    # basename(filePath) gives the file name of a (Windows) path, so joins on file names
+    # can be done in SQL without deriving an extra column in pandas first.
+    connection.create_function('basename', 1, _getFileName, deterministic=True)
+    return connection
+
+
+def _getSqlType(column):
+    """
+    Return the SQLite column type for a pandas Series, following `DataFrame.to_sql`.
+
+    Parameters
+    ----------
+    column : pandas.Series
+        The column to determine the type for.
+
+    Returns
+    -------
+    str
+        'INTEGER', 'REAL', 'TIMESTAMP', 'DATE', 'TIME' or 'TEXT'.
+    """
+    inferredType = pd.api.types.infer_dtype(column, skipna=True)
+    if inferredType in ('integer', 'boolean', 'timedelta64'):
+        return 'INTEGER'
+    if inferredType == 'floating':
+        return 'REAL'
+    if inferredType in ('datetime64', 'datetime'):
+        return 'TIMESTAMP'
+    if inferredType == 'date':
+        return 'DATE'
+    if inferredType == 'time':
+        return 'TIME'
+    return 'TEXT'
+
+
+def _toSqlValue(value):
+    """
+    Convert a date or time to the string `DataFrame.to_sql` stores for it.
+
+    Parameters
+    ----------
+    value : object
+        A value from a DataFrame column.
+
+    Returns
+    -------
+    object
+        The ISO formatted string for datetimes (including `pandas.Timestamp`),
+        dates and times, otherwise the value itself.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(' ')
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, datetime.time):
+        return value.strftime('%H:%M:%S.%f')
+    return value
+
+
+def bulkReplaceTable(connection, tableName, df, columnTypes=None):
+    """
+    Replace a SQLite table with the contents of a DataFrame in a single transaction.
+
+    The table is dropped and recreated with an explicit schema, after which all
+    rows are inserted with one `executemany` call. This avoids the per-statement
+    overhead of `DataFrame.to_sql` and commits only once.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        An open connection to the database, see `connectToDatabase`.
+    tableName : str
+        Name of the table to be replaced.
+    df : pandas.DataFrame
+        The data to be stored. The DataFrame index is not stored.
+    columnTypes : dict of str, optional
+        SQLite column type per column name. Columns that are not specified get
+        the type `DataFrame.to_sql` would give them.
+
+    Returns
+    -------
+    None
+    """
+    columnTypes = columnTypes or {}
+    columnDefinitions = ', '.join(f'"{column}" {columnTypes.get(column, _getSqlType(df[column]))}'
+                                  for column in df.columns)
+    placeholders = ', '.join('?' * len(df.columns))
+
+    # Missing values are stored as NULL, NumPy scalars are converted to Python objects and
+    # dates and times are stored as the strings `DataFrame.to_sql` would write, because
+    # sqlite3 cannot bind them. Other object columns without missing values (e.g. file
+    # paths and hashes) are bound as they are, so only the columns that need it are converted.
+    columnValues = []
+    for column in df.columns:
+        values = df[column]
+        isMissing = values.isna()
+        if pd.api.types.infer_dtype(values, skipna=True) in ('datetime64', 'datetime', 'date', 'time', 'mixed'):
+            columnValues.append([None if missing else _toSqlValue(value)
+                                 for value, missing in zip(values.astype(object), isMissing)])
+        elif values.dtype == object and not isMissing.any():
+            columnValues.append(values.tolist())
+        else:
+            columnValues.append(values.astype(object).where(~isMissing, None).tolist())
+    rows = zip(*columnValues)
+
+    with connection:
+        connection.execute(f'DROP TABLE IF EXISTS "{tableName}"')
+        connection.execute(f'CREATE TABLE "{tableName}" ({columnDefinitions})')
+        connection.executemany(f'INSERT INTO "{tableName}" VALUES ({placeholders})', rows)
+
+
 def makeTables(tablesPath):
     """
     Initialize the SQLite database schema by creating all required tables.
@@ -403,6 +978,7 @@ def makeTables(tablesPath):
     - exifData: Stores selected Exif metadata (e.g., file size, resolution).
     - conversionNames: Stores MaisFlexis conversion records, linked to files by md5Hash.
     - descriptionData: Stores descriptive metadata, also linked to files by md5Hash.
+    - uniqueColorCache: Stores the number of unique colors per md5Hash, reused across runs.
 
     Parameters
     ----------
@@ -414,7 +990,7 @@ def makeTables(tablesPath):
     None
     """
     # Creating the database file in tablesPath and establishing a connection.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
 
     connection.executescript('PRAGMA foreign_keys = ON')
@@ -433,7 +1009,7 @@ def makeTables(tablesPath):
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS exifData (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
-        FileSize TEXT,
+        FileSize INTEGER,
         XResolution INT,
         YResolution INT
         )
@@ -469,10 +1045,65 @@ def makeTables(tablesPath):
         )
     ''')
 
+    # The cache is kept across runs, so the unique colors are only counted once per file.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS uniqueColorCache (
+        md5Hash TEXT PRIMARY KEY,
+        numUniqueColors INTEGER,
+        mtime REAL
+        )
+    ''')
+
     connection.commit()
     connection.close() 
 
 
+# Presence table with one entry per possible 24-bit RGB color, allocated once per worker process.
+_colorPresence = None
+
+
+def _countUniqueColors(filePath):
+    """
+    Count the number of unique RGB colors of a single image.
+
+    Defined at module level so it can be pickled and run in the worker
+    processes started by `getUniqueColors`. The colors are counted by marking
+    them in a presence table of 2^24 entries, which takes linear time and
+    avoids sorting every pixel of the image.
+
+    Parameters
+    ----------
+    filePath : str
+        Path to the image to analyze.
+
+    Returns
+    -------
+    int or str
+        The number of unique colors, or an error message if processing failed.
+    """
+    # Worker processes do not inherit this setting, so it is disabled here as well.
+    Image.MAX_IMAGE_PIXELS = None
+    global _colorPresence
+    if _colorPresence is None:
+        _colorPresence = np.zeros(1 << 24, dtype=bool)
+    try:
+        image = Image.open(filePath)
+        image = image.convert('RGB')
+        # Packing each RGB pixel into a single uint32 lets NumPy count the distinct
+        # colors directly, instead of materializing Pillow's list of (count, color) tuples.
+        pixels = np.asarray(image, dtype=np.uint8).reshape(-1, 3)
+        packedPixels = (pixels[:, 0].astype(np.uint32) << 16) | (pixels[:, 1].astype(np.uint32) << 8) | pixels[:, 2]
+        _colorPresence[packedPixels] = True
+        try:
+            return int(np.count_nonzero(_colorPresence))
+        # Only the entries that were set are cleared, so the table can be reused for the next image.
+        finally:
+            _colorPresence[packedPixels] = False
+    # When the process fails we return the error message instead.
+    except Exception as e:
+        return f"Error processing {filePath}: {e}"
+
+
 def getUniqueColors(imageFilePaths):
     """
     Count the number of unique RGB colors for each image in a list of file paths.
@@ -480,6 +1111,8 @@ def getUniqueColors(imageFilePaths):
     Each image is opened, converted to RGB, and analyzed to determine the total
     number of distinct colors. Since each channel (R, G, B) has 256 possible values,
     the theoretical maximum is 256^3 = 16,777,216 unique colors per image.
+    The images are independent of each other, so they are processed in parallel
+    across all available CPU cores.
 
     **Important:** To avoid errors when processing very large images, the function
     disables the PIL.Image.MAX_IMAGE_PIXELS limit by setting it to None. By default,
@@ -504,34 +1137,90 @@ def getUniqueColors(imageFilePaths):
         - the number of unique colors (int) for each image, or
         - an error message (str) if processing failed.
     """
-    # This has to be further specified.
-    # Find max value in database 
-    Image.MAX_IMAGE_PIXELS = None
-
     numUniqueColorsList = [] 
    
     # Calculate the number of unique colors for each of the files in the list of paths.
-    for i in tqdm.tqdm(range(len((imageFilePaths))),
-                    desc='[START] Extracting number of unique colors.',
-                    bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
-                    ncols=80, 
-                    ascii=" ░▒▓█"):
-        try:
-            image = Image.open(imageFilePaths[i])
-            image = image.convert('RGB')
-            colors = image.getcolors(maxcolors=256*256*256)
-            numUniqueColors = len(colors)
+    # executor.map preserves the input order, so the results stay aligned with imageFilePaths.
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for numUniqueColors in tqdm.tqdm(executor.map(_countUniqueColors, imageFilePaths, chunksize=8),
+                                         total=len(imageFilePaths),
+                                         desc='[START] Extracting number of unique colors.',
+                                         bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
+                                         ncols=80, 
+                                         ascii=" ░▒▓█"):
+            # Errors are returned as messages and added to match the length of the pandas DataFrame.
+            if isinstance(numUniqueColors, str):
+                tqdm.tqdm.write(numUniqueColors)
             numUniqueColorsList.append(numUniqueColors)
-        # When the process fails we execute the following steps:
-        except Exception as e:
-            message = f"Error processing {imageFilePaths[i]}: {e}"
-            # Add to numUniqueColorsList to match the lengath of the pandas DataFrame.
-            numUniqueColorsList.append(message)
-            print(message)
     print(f'[√] Calculated number of unique colors succesfully!')
     return numUniqueColorsList
 
 
+def getUniqueColorsCached(connection, imageFilePaths):
+    """
+    Count the number of unique RGB colors per image, reusing earlier results where possible.
+
+    Results are cached in the 'uniqueColorCache' table, keyed by the md5Hash of the
+    file from the 'initialHashes' table. Only images whose md5Hash is not in the cache,
+    or whose modification time changed since it was cached, are decoded again with
+    `getUniqueColors`. New results are upserted into the cache.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        Open connection to the database containing the 'initialHashes' and
+        'uniqueColorCache' tables.
+    imageFilePaths : list of str
+        List of file paths to the images to analyze.
+
+    Returns
+    -------
+    list of int or str
+        A list containing either:
+        - the number of unique colors (int) for each image, or
+        - an error message (str) if processing failed.
+    """
+    # Looking up the md5Hash and the current modification time of each file.
+    candidatesDF = pd.DataFrame({'filePath': imageFilePaths})
+    md5HashesDF = pd.read_sql("SELECT filePath, md5Hash FROM initialHashes", con=connection)
+    candidatesDF = candidatesDF.merge(md5HashesDF.drop_duplicates('filePath'), on='filePath', how='left')
+    candidatesDF['mtime'] = [os.path.getmtime(p) if os.path.exists(p) else np.nan for p in imageFilePaths]
+
+    # Left-joining the candidates against the cache.
+    cacheDF = pd.read_sql("""
+    SELECT md5Hash, numUniqueColors AS cachedNumUniqueColors, mtime AS cachedMtime
+    FROM uniqueColorCache
+    """, con=connection)
+    candidatesDF = candidatesDF.merge(cacheDF, on='md5Hash', how='left')
+    isStale = (candidatesDF['cachedNumUniqueColors'].isna() |
+               (candidatesDF['cachedMtime'] != candidatesDF['mtime'])).tolist()
+
+    numUniqueColorsList = [None if stale else int(cached) for stale, cached in
+                           zip(isStale, candidatesDF['cachedNumUniqueColors'])]
+    staleIndices = [i for i, stale in enumerate(isStale) if stale]
+    print(f'[INFO] {len(imageFilePaths) - len(staleIndices)} of {len(imageFilePaths)} images found in the unique color cache.')
+
+    if staleIndices:
+        staleResults = getUniqueColors([imageFilePaths[i] for i in staleIndices])
+        cacheRows = []
+        for i, numUniqueColors in zip(staleIndices, staleResults):
+            numUniqueColorsList[i] = numUniqueColors
+            md5Hash, mtime = candidatesDF.at[i, 'md5Hash'], candidatesDF.at[i, 'mtime']
+            # Error messages and files without a md5Hash or modification time are not cached.
+            if isinstance(numUniqueColors, int) and pd.notna(md5Hash) and pd.notna(mtime):
+                cacheRows.append((md5Hash, numUniqueColors, float(mtime)))
+
+        with connection:
+            connection.executemany("""
+            INSERT INTO uniqueColorCache (md5Hash, numUniqueColors, mtime) VALUES (?, ?, ?)
+            ON CONFLICT(md5Hash) DO UPDATE SET
+                numUniqueColors = excluded.numUniqueColors,
+                mtime = excluded.mtime
+            """, cacheRows)
+
+    return numUniqueColorsList
+
+
 def getUniqueColorsTable(tablesPath, processedDataPath):
     """
     Extract the highest-resolution image per hash, compute the number of unique RGB colors,
@@ -539,7 +1228,7 @@ def getUniqueColorsTable(tablesPath, processedDataPath):
 
     For each hash value, the function selects images with the highest resolution. It then calculates
     the number of unique colors in these images (up to 256^3 possible RGB values) using the
-    `getUniqueColors` function. The results are saved to a table named 'uniqueColorData' in the
+    `getUniqueColorsCached` function, which only decodes images that are not cached yet. The results are saved to a table named 'uniqueColorData' in the
     database and as a CSV file in the specified processed data path.
 
     Parameters
@@ -554,7 +1243,7 @@ def getUniqueColorsTable(tablesPath, processedDataPath):
     None
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     
     # From the similar images, the highest resolutions are extracted.
     similarImagesSameResolution = """
@@ -617,17 +1306,18 @@ def getUniqueColorsTable(tablesPath, processedDataPath):
     pd.read_sql(similarImagesSameResolution, con=connection)
     
     # The similar images where this is the case  are used to calculate the number of unique colors if
+    # Results of earlier runs are reused from the uniqueColorCache table.
     if len(uniqueColorsDF) > 0:
-        uniqueColorsDF['numUniqueColors'] = getUniqueColors(uniqueColorsDF['filePath'].tolist())
+        uniqueColorsDF['numUniqueColors'] = getUniqueColorsCached(connection, uniqueColorsDF['filePath'].tolist())
     
     else:
         uniqueColorsDF['numUniqueColors'] = np.nan
 
-    uniqueColorsDF.to_sql('uniqueColorData', con=connection,
-                        if_exists='replace', index=False)
+    bulkReplaceTable(connection, 'uniqueColorData', uniqueColorsDF)
 
     # Saving the uniqueColorsDF to CSV.
     uniqueColorsDF.to_csv(os.path.join(processedDataPath, 'uniqueColors.csv'), index=False)
+    connection.close()
 
 
 def getInitialImageData(allImageFilePaths, exifToolPath, hashPath, exifDataPath):
@@ -707,21 +1397,43 @@ def fillTablesInitialData(exifData, initialHashData, tablesPath):
     Notes
     -----
     - This function overwrites any existing tables with the same names in the database.
+    - Each table is loaded in a single transaction with `bulkReplaceTable`; the covering
+      indexes on `initialHashes(md5Hash, aHash, filePath)` and `initialHashes(aHash, md5Hash,
+      filePath)` are created after the load.
     - Connection to the database is automatically closed after the operation.
     - Errors during insertion are caught and printed.
     """
     try:
         # Connecting to the database in tablesPath.
-        connection = sqlite3.connect(database=tablesPath)
+        connection = connectToDatabase(tablesPath)
         # Inserting the data from the DataFrame into the SQLite tables.
 
         print('\n[START] Inserting the initial image data into the SQL tables.')
-        print('[√] Tables filled succesfully!')
 
-        exifData.to_sql('exifData', con=connection,
-                       if_exists='replace', index=False)  
-        initialHashData.to_sql('initialHashes', con=connection,
-                             if_exists='replace', index=False)
+        # Each table is loaded in a single transaction with one executemany call.
+        # The explicit column types make SQLite keep the integer storage class for the
+        # resolution fields, which are held in object columns in the DataFrame.
+        bulkReplaceTable(connection, 'exifData', exifData,
+                         columnTypes={'filePath': 'TEXT',
+                                      'FileSize': 'INTEGER',
+                                      'XResolution': 'INTEGER',
+                                      'YResolution': 'INTEGER',
+                                      'ImageWidth': 'INTEGER',
+                                      'ImageHeight': 'INTEGER'})
+        bulkReplaceTable(connection, 'initialHashes', initialHashData,
+                         columnTypes={'md5Hash': 'TEXT',
+                                      'aHash': 'TEXT',
+                                      'filePath': 'TEXT'})
+        with connection:
+            # The indexes are created after the load, so they are built once instead of per insert.
+            # Both cover all columns of the duplicate queries, which can then be answered from
+            # the indexes alone, already sorted by either md5Hash or aHash.
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_initialHashes_md5_aHash '
+                               'ON initialHashes(md5Hash, aHash, filePath)')
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_initialHashes_aHash_md5 '
+                               'ON initialHashes(aHash, md5Hash, filePath)')
+
+        print('[√] Tables filled succesfully!')
 
     except sqlite3.Error as error:
         print("Failed to insert Python variable into sqlite table", error)
@@ -765,68 +1477,55 @@ def getExactDuplicates(tablesPath, exifToolPath, processedDataPath):
     print('|------------------------------------------------------------------------|')
     print('\n[START] Analyzing initial hash data.')
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
 
-    # Performing queries to find possible duplicates
-    #images where both md5Hash and aHash are duplicated (exact duplicates).
-    queryMD5andImageHash = """
-    SELECT md5Hash, aHash, filePath
-    FROM initialHashes
-    WHERE (md5Hash, aHash) IN (
-        SELECT md5Hash, aHash
-        FROM initialHashes
-        GROUP BY md5Hash, aHash
-        HAVING COUNT(*) > 1
-    )
-    ORDER BY md5Hash
-    """
+    # Calculating the per-hash counts once, in a temporary table of this connection.
+    # Both the candidate query below and the exactDuplicates table are derived from it.
+    cursor.executescript("""
+    DROP TABLE IF EXISTS temp.initialHashCounts;
 
-    # Images were md5Hash is duplicated but not aHash (possible md5 collision).
-    queryMD5notImageHash = """
-    SELECT md5Hash, aHash, filePath
-    FROM initialHashes
-    WHERE md5Hash IN (
-        SELECT md5Hash
-        FROM initialHashes
-        GROUP BY md5Hash
-        HAVING COUNT(*) > 1
-        )
-    AND aHash NOT IN (
-        SELECT aHash
-        FROM initialHashes
-        GROUP BY aHash
-        HAVING COUNT(*) > 1
-    )
-    ORDER BY md5Hash, aHash;
-    """
+    CREATE TEMP TABLE initialHashCounts AS
+    SELECT
+        md5Hash,
+        aHash,
+        filePath,
+        COUNT(*) OVER (PARTITION BY md5Hash) AS md5Count,
+        COUNT(*) OVER (PARTITION BY aHash) AS aHashCount,
+        COUNT(*) OVER (PARTITION BY md5Hash, aHash) AS pairCount
+    FROM initialHashes;
+    """)
 
-    # Images were md5Hash is not duplicated but aHash is (possible aHash collision).
-    queryNotMD5AndImageHash = """
-    SELECT md5Hash, aHash, filePath
-    FROM initialHashes
-    WHERE aHash IN (
-        SELECT aHash
-        FROM initialHashes
-        GROUP BY aHash
-        HAVING COUNT(*) > 1
-        )
-    AND md5Hash NOT IN (
-        SELECT md5Hash
-        FROM initialHashes
-        GROUP BY md5Hash
-        HAVING COUNT(*) > 1
-    )
-    ORDER BY aHash, md5Hash;
+    # Performing a single query to find possible duplicates.
+    # The counts classify every row in one pass over initialHashCounts:
+    # - 'both': images where both md5Hash and aHash are duplicated (exact duplicates).
+    # - 'md5Only': images where md5Hash is duplicated but not aHash (possible md5 collision).
+    # - 'aHashOnly': images where aHash is duplicated but not md5Hash (possible aHash collision).
+    queryDuplicateCandidates = """
+    SELECT
+        md5Hash,
+        aHash,
+        filePath,
+        CASE
+            WHEN pairCount > 1 THEN 'both'
+            WHEN md5Count > 1 AND aHashCount = 1 THEN 'md5Only'
+            ELSE 'aHashOnly'
+        END AS duplicateKind
+    FROM initialHashCounts
+    WHERE pairCount > 1
+       OR (md5Count > 1 AND aHashCount = 1)
+       OR (aHashCount > 1 AND md5Count = 1)
+    ORDER BY md5Hash, aHash, filePath;
     """
 
-    # Executing the above queries and loading the results into DataFrames.
-    aHashAndMD5 = pd.read_sql(queryMD5andImageHash,
-                            con=connection)
-    noAHashAndMD5 = pd.read_sql(queryMD5notImageHash,
-                                con=connection)
-    aHashAndNotMD5 = pd.read_sql(queryNotMD5AndImageHash,
-                                con=connection)
+    # Executing the above query and splitting the results into DataFrames per kind.
+    duplicateCandidates = pd.read_sql(queryDuplicateCandidates,
+                                      con=connection)
+    hashColumns = ['md5Hash', 'aHash', 'filePath']
+    noAHashAndMD5 = duplicateCandidates.loc[duplicateCandidates['duplicateKind'] == 'md5Only',
+                                            hashColumns].reset_index(drop=True)
+    aHashAndNotMD5 = duplicateCandidates.loc[duplicateCandidates['duplicateKind'] == 'aHashOnly',
+                                             hashColumns].reset_index(drop=True)
     print('[√] Analyzed initial hash data succesfully!')
     # Calculating the additional hashes only when needed.
     if len(noAHashAndMD5) > 0 or len(aHashAndNotMD5) > 0:
@@ -840,86 +1539,53 @@ def getExactDuplicates(tablesPath, exifToolPath, processedDataPath):
     if len(aHashAndNotMD5) > 0:
         algorithm = 'pHash'
         print()
-        aHashAndNotMD5['pHash'] = [getImageHash(aHashAndNotMD5['filePath'].tolist()[i], algorithm='phash') 
-                                for i in tqdm.tqdm(range(len(aHashAndNotMD5['filePath'].tolist())),
-                                desc=f' * [START] Calculating {algorithm}es', 
-                                bar_format="{desc}: {percentage:5.2f}% |{bar}| {n_fmt}/{total_fmt}", 
-                                ncols=80, 
-                                ascii=" ░▒▓█")]
+        aHashAndNotMD5['pHash'] = getPerceptualHashes(aHashAndNotMD5['filePath'].tolist())
         
         print(f' * [√] {algorithm}es calculated succesfully!')
         print(f'\n[√] additional hashes calculated succesfully!')
-    # Combining results into a single DataFrame.
-    finalHashesDF = pd.concat([aHashAndMD5,
-                                noAHashAndMD5,  
-                                aHashAndNotMD5])
-
-    # Extracting rows with calculated additional hashes only if data is available.
-    # If no data is available, an empty DataFrame with the required column names will be created.
-    # This ensures that SQL queries can still be run even when the resulting table has no data.
-    sha256Rows =\
-    finalHashesDF[['filePath', 'sha256Hash']].dropna() if 'sha256Hash' in finalHashesDF.columns \
-                                                       else pd.DataFrame(columns=['filePath', 'sha256Hash'])
-
-    pHashRows =\
-    finalHashesDF[['filePath', 'pHash']].dropna() if 'pHash' in finalHashesDF.columns \
-                                                  else pd.DataFrame(columns=['filePath', 'pHash'])
-
-
-    # Conditional storing of the results in SQLite tables.
-    # Only when there is data in the DataFrame.
-    if not sha256Rows.empty:
-        sha256Rows.to_sql(name='sha256Rows', 
-                        con=connection, 
-                        if_exists='replace',
-                        index=False)
-    # If the DataFrame is empty, create the table with the correct schema (no data).
-    else:
-        sha256Rows.iloc[0:0].to_sql(name='sha256Rows', 
-                        con=connection, 
-                        if_exists='replace',
-                        index=False)
-        
-    if not pHashRows.empty:
-        pHashRows.to_sql(name='pHashes',
-                        con=connection,
-                        if_exists='replace',
-                        index=False)
-    # If the DataFrame is empty, create the table with the correct schema (no data).
-    else:
-        pHashRows.iloc[0:0].to_sql(name='pHashes',
-                        con=connection,
-                        if_exists='replace',
-                        index=False)
-
-    cursor.execute("DROP TABLE IF EXISTS exactDuplicates;")
-    connection.commit()
+    # Storing the additional hashes in SQLite tables, straight from the DataFrames they were
+    # calculated for. The tables are always created, so the SQL queries below can still be run
+    # when there is no data.
+    with connection:
+        connection.executescript("""
+        DROP TABLE IF EXISTS sha256Rows;
+        CREATE TABLE sha256Rows (filePath TEXT, sha256Hash TEXT);
+        DROP TABLE IF EXISTS pHashes;
+        CREATE TABLE pHashes (filePath TEXT, pHash TEXT);
+        """)
+        if 'sha256Hash' in noAHashAndMD5.columns:
+            connection.executemany("INSERT INTO sha256Rows (filePath, sha256Hash) VALUES (?, ?)",
+                                   zip(noAHashAndMD5['filePath'], noAHashAndMD5['sha256Hash']))
+        if 'pHash' in aHashAndNotMD5.columns:
+            connection.executemany("INSERT INTO pHashes (filePath, pHash) VALUES (?, ?)",
+                                   zip(aHashAndNotMD5['filePath'], aHashAndNotMD5['pHash']))
 
     # Creating the table for exact duplicates.
+    # The md5 groups reuse the counts in initialHashCounts, the sha256 group sizes are
+    # calculated with a window function, so each table is scanned once.
     cursor.executescript("""
     DROP TABLE IF EXISTS exactDuplicates;
 
     CREATE TABLE exactDuplicates AS
-    SELECT 'md5Hash' AS hashType, md5Hash AS hashValue, filePath
-    FROM initialHashes
-    WHERE (md5Hash, aHash) IN (
-        SELECT md5Hash, aHash
-        FROM initialHashes
-        GROUP BY md5Hash, aHash
-        HAVING COUNT(*) > 1
+    WITH sha256Groups AS (
+        SELECT
+            sha256Hash,
+            filePath,
+            COUNT(*) OVER (PARTITION BY sha256Hash) AS groupCount
+        FROM sha256Rows
     )
+    SELECT 'md5Hash' AS hashType, md5Hash AS hashValue, filePath
+    FROM initialHashCounts
+    WHERE pairCount > 1
 
     UNION ALL
 
     SELECT 'sha256Hash' AS hashType, sha256Hash AS hashValue, filePath
-    FROM sha256Rows
-    WHERE sha256Hash IN (
-        SELECT sha256Hash
-        FROM sha256Rows
-        GROUP BY sha256Hash
-        HAVING COUNT(*) > 1
-    )
+    FROM sha256Groups
+    WHERE groupCount > 1
     ORDER BY hashType, hashValue, filePath;
+
+    DROP TABLE temp.initialHashCounts;
     """)
     connection.commit()
 
@@ -931,15 +1597,107 @@ def getExactDuplicates(tablesPath, exifToolPath, processedDataPath):
     connection.close()
 
 
-def mapDuplicatesToConversionNames(tablesPath, rawDataRecords, exactDuplicates, pathToExactDuplicatesMatchedMapped):
+def loadSourceTable(connection, tableName, sourcePath, readSource):
+    """
+    Load a source file into a SQLite table, unless the same file was loaded before unchanged.
+
+    The path, modification time and size of every loaded file are recorded in the
+    `loadedSources` table. When the file has not changed since it was loaded into the
+    table, reading and storing it again is skipped.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        An open connection to the database.
+    tableName : str
+        Name of the table to be (re)loaded.
+    sourcePath : str
+        Path to the source file.
+    readSource : callable
+        Function that reads the source file into a pandas DataFrame, given its path.
+
+    Returns
+    -------
+    bool
+        True if the table was (re)loaded, False if the existing table was kept.
+    """
+    sourceStat = os.stat(sourcePath)
+    sourceKey = (os.path.abspath(sourcePath), sourceStat.st_mtime, sourceStat.st_size)
+
+    with connection:
+        connection.execute("""
+        CREATE TABLE IF NOT EXISTS loadedSources (
+            tableName TEXT PRIMARY KEY,
+            sourcePath TEXT,
+            mtime REAL,
+            size INTEGER
+        )
+        """)
+    loadedSource = connection.execute("SELECT sourcePath, mtime, size FROM loadedSources WHERE tableName = ?",
+                                      (tableName,)).fetchone()
+    tableExists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                     (tableName,)).fetchone() is not None
+
+    if tableExists and loadedSource == sourceKey:
+        return False
+
+    bulkReplaceTable(connection, tableName, readSource(sourcePath))
+    with connection:
+        connection.execute("""
+        INSERT INTO loadedSources (tableName, sourcePath, mtime, size) VALUES (?, ?, ?, ?)
+        ON CONFLICT(tableName) DO UPDATE SET
+            sourcePath = excluded.sourcePath,
+            mtime = excluded.mtime,
+            size = excluded.size
+        """, (tableName, *sourceKey))
+    return True
+
+
+def _indexMappingTables(connection):
+    """
+    Index the join columns of the tables used to map images to MaisFlexis records.
+
+    The mapping tables are (re)created from DataFrames without any indexes, so without
+    these the joins on `Bestandsnaam` and `ID` scan the joined table for every image.
+    `ANALYZE` updates the statistics the query planner uses to order the joins.
+
+    Parameters
+    ----------
+    connection : sqlite3.Connection
+        An open connection to the database.
+
+    Returns
+    -------
+    None
+    """
+    joinColumns = [('rawDataRecords', 'Bestandsnaam'),
+                   ('conversionNames', 'ID'),
+                   ('descriptionData', 'ID')]
+    existingTables = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+    with connection:
+        for table, column in joinColumns:
+            if table in existingTables:
+                connection.execute(f'CREATE INDEX IF NOT EXISTS ix_{table}_{column} ON {table}({column})')
+        connection.execute('ANALYZE')
+
+
+def _readRawDataRecords(rawDataRecords):
+    """
+    Read the MaisFlexis raw data records CSV, with the file name column normalized for joining.
+    """
+    rawDataRecordsDF = pd.read_csv(rawDataRecords, delimiter=',', low_memory=False)
+    return rawDataRecordsDF.rename(columns={'BESTANDSNAAM': 'Bestandsnaam'})
+
+
+def mapDuplicatesToConversionNames(tablesPath, rawDataRecords, pathToExactDuplicatesMatchedMapped):
     """
     Map exact duplicate images to MaisFlexis conversion records and export the results.
 
-    This function reads exact duplicate image records and raw MaisFlexis data, transforms 
-    the data, and maps each duplicate image to its corresponding MaisFlexis record based on 
-    filename matching. Additional conversion and description information is added, and a 
-    mapping status column indicates whether a match was found. The final results are saved 
-    to an Excel sheet and returned as a DataFrame.
+    This function loads the raw MaisFlexis data and maps each image in the `exactDuplicates`
+    table to its corresponding MaisFlexis record based on filename matching. Additional
+    conversion and description information is added, and a mapping status column indicates
+    whether a match was found. The final results are saved to an Excel sheet.
 
     Parameters
     ----------
@@ -947,40 +1705,33 @@ def mapDuplicatesToConversionNames(tablesPath, rawDataRecords, exactDuplicates,
         Path to the SQLite database file used for intermediate storage.
     rawDataRecords : str
         Path to the CSV file containing raw MaisFlexis records.
-    exactDuplicates : str
-        Path to the CSV file containing exact duplicate image information.
     pathToExactDuplicatesMatchedMapped : str
         Path to the Excel file where the mapped results will be saved.
 
     Returns
     -------
-    pandas.DataFrame
-        DataFrame containing mapped duplicates, conversion information, hash details, 
-        and mapping status ('gekoppeld' or 'ongekoppeld').
+    None
+        The mapped duplicates, with conversion information, hash details and mapping
+        status ('gekoppeld' or 'ongekoppeld'), are stored in the `mappedDuplicates`
+        table and written to Excel.
 
     Notes
     -----
-    - Existing tables in the database (`exactDuplicates`, `rawDataRecords`, `mappedDuplicates`) will be replaced.
-    - Filename extraction assumes backslash (`\\`) separators in paths.
-    - Uses a utility function `utils.writeDfToExcelSheet` to export results to Excel.
+    - The `rawDataRecords` table is replaced when the CSV changed since it was last loaded,
+      the `mappedDuplicates` table is always replaced.
+    - File names are extracted from the paths in SQL with the `basename` function.
+    - The rows are streamed from the database to a new Excel file with `utils.writeRowsToExcelSheet`.
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
     print('\n################## Mapping duplicates to MaisFlexis records ##################')
     print('|------------------------------------------------------------------------|')
     print('\n[START] Transforming duplicate records and preparing data for mapping.')
 
-    rawDataRecordsDF = pd.read_csv(rawDataRecords, delimiter=',', low_memory=False)
-    exactDuplicatesDF = pd.read_csv(exactDuplicates)
-
-    exactDuplicatesDF['Bestandsnaam'] = exactDuplicatesDF['filePath'].str.split('\\').str.get(-1)
-
-    # Save tables to DB
-    exactDuplicatesDF.to_sql(name='exactDuplicates', con=connection, if_exists='replace', index=False)
-
-    rawDataRecordsDF.rename(columns={'BESTANDSNAAM': 'Bestandsnaam'}, inplace=True)
-    rawDataRecordsDF.to_sql(name='rawDataRecords', con=connection, if_exists='replace', index=False)
+    # Save tables to DB, the CSV is only read again when it changed since it was last loaded.
+    loadSourceTable(connection, 'rawDataRecords', rawDataRecords, _readRawDataRecords)
+    _indexMappingTables(connection)
 
     print('[√] Data transformed and loaded into the database.')
     print('\n[START] Mapping exact duplicates to MaisFlexis conversion names.')
@@ -997,7 +1748,7 @@ def mapDuplicatesToConversionNames(tablesPath, rawDataRecords, exactDuplicates,
     FROM 
         exactDuplicates d
     LEFT JOIN 
-        rawDataRecords r ON d.Bestandsnaam = r.Bestandsnaam
+        rawDataRecords r ON basename(d.filePath) = r.Bestandsnaam
     LEFT JOIN
         conversionNames c ON r.ID = c.ID
     LEFT JOIN
@@ -1006,27 +1757,122 @@ def mapDuplicatesToConversionNames(tablesPath, rawDataRecords, exactDuplicates,
     cursor.executescript(mappedDuplicatesQuery)
     connection.commit()
 
-    mappedDuplicatesDF = pd.read_sql("SELECT * FROM mappedDuplicates", con=connection)
-    mappedDuplicatesDF = mappedDuplicatesDF.reset_index(drop=True)
-
-    utils.writeDfToExcelSheet(pathToExactDuplicatesMatchedMapped, mappedDuplicatesDF, sheet_name='exactDuplicatesMapped')
+    # Streaming the rows from the database into the Excel file.
+    mappedDuplicatesCursor = connection.execute("SELECT * FROM mappedDuplicates")
+    utils.writeRowsToExcelSheet(pathToExactDuplicatesMatchedMapped,
+                                [column[0] for column in mappedDuplicatesCursor.description],
+                                mappedDuplicatesCursor,
+                                sheet_name='exactDuplicatesMapped')
 
     connection.close()
 
     print('[√] Exact duplicates successfully mapped to MaisFlexis records!')
     print(f'Results saved to: {pathToExactDuplicatesMatchedMapped}')
 
-    return mappedDuplicatesDF
 
+def _groupSimilarHashes(hashValues, maxDistance=5):
+    """
+    Group 64-bit hexadecimal hashes that lie within a Hamming distance of each other.
+
+    Candidate pairs are found with a multi-index search instead of comparing all
+    pairs: the 64 bits are split into maxDistance // 2 + 1 blocks, so by the
+    pigeonhole principle two hashes within `maxDistance` of each other differ in
+    at most one bit in at least one block. Per block, every hash is looked up in
+    the sorted block values with each of its block values that differ in at most
+    one bit. The candidates are then checked with `np.bitwise_count`.
+    The hashes are then grouped in sorted order: a hash that is not in a group yet
+    starts a new group, which each of its neighbours joins when it lies within
+    `maxDistance` of every hash already in the group. A chain of hashes that are
+    each close to the next is therefore split, instead of becoming one group whose
+    ends differ in many more bits. Every group is labeled with its smallest hash.
+    Values that are not 64-bit hexadecimal hashes (e.g. error messages) are only
+    grouped with identical values.
+
+    Parameters
+    ----------
+    hashValues : list of str
+        The hashes to be grouped.
+    maxDistance : int, optional
+        Maximum number of differing bits between any two hashes in a group. Default is 5.
 
-def getSimilarImages(tablesPath, processedDataPath):
+    Returns
+    -------
+    list of str
+        The group label (smallest hash of the group) for each of the hashValues.
+    """
+    isHash = [isinstance(hashValue, str) and len(hashValue) == 16 and
+              all(character in '0123456789abcdef' for character in hashValue) for hashValue in hashValues]
+    uniqueHashes = sorted({hashValue for hashValue, valid in zip(hashValues, isHash) if valid})
+    labels = dict(zip(uniqueHashes, uniqueHashes))
+
+    if len(uniqueHashes) > 1:
+        hashInts = np.array([int(hashValue, 16) for hashValue in uniqueHashes], dtype=np.uint64)
+        hashIndex = np.arange(len(hashInts))
+        numBlocks = maxDistance // 2 + 1
+        blockEdges = np.linspace(0, 64, numBlocks + 1).astype(int)
+
+        rows, columns = [], []
+        for blockStart, blockEnd in zip(blockEdges[:-1], blockEdges[1:]):
+            blockWidth = int(blockEnd - blockStart)
+            blockMask = np.uint64((1 << blockWidth) - 1) if blockWidth < 64 else np.uint64(2**64 - 1)
+            blockValues = (hashInts >> np.uint64(blockStart)) & blockMask
+            order = np.argsort(blockValues, kind='stable')
+            sortedBlockValues = blockValues[order]
+
+            # Looking up the block value itself and every value that differs in one bit.
+            for flippedBits in [0] + [1 << bit for bit in range(blockWidth)]:
+                queries = blockValues ^ np.uint64(flippedBits)
+                lower = np.searchsorted(sortedBlockValues, queries, side='left')
+                upper = np.searchsorted(sortedBlockValues, queries, side='right')
+                counts = upper - lower
+                if counts.sum() == 0:
+                    continue
+                # Expanding the [lower, upper) ranges into (query, candidate) index pairs.
+                candidateRows = np.repeat(hashIndex, counts)
+                offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                candidateColumns = order[np.repeat(lower, counts) + offsets]
+
+                # Each pair only has to be checked once, as the distance is symmetric.
+                keep = candidateRows < candidateColumns
+                candidateRows, candidateColumns = candidateRows[keep], candidateColumns[keep]
+                isClose = np.bitwise_count(hashInts[candidateRows] ^ hashInts[candidateColumns]) <= maxDistance
+                rows.append(candidateRows[isClose])
+                columns.append(candidateColumns[isClose])
+
+        # The neighbours of each hash (both ways round), in sorted order.
+        rows, columns = np.concatenate(rows), np.concatenate(columns)
+        neighbours = scipy.sparse.coo_matrix((np.ones(len(rows), dtype=np.int8), (rows, columns)),
+                                             shape=(len(hashInts), len(hashInts)))
+        neighbours = (neighbours + neighbours.T).tocsr()
+        neighbours.sort_indices()
+
+        # uniqueHashes is sorted, so the hash that starts a group is its smallest. Hashes without
+        # neighbours form a group of their own.
+        groupStart = np.full(len(hashInts), -1)
+        for start in np.flatnonzero(np.diff(neighbours.indptr)):
+            if groupStart[start] >= 0:
+                continue
+            groupStart[start] = start
+            members = [start]
+            for candidate in neighbours.indices[neighbours.indptr[start]:neighbours.indptr[start + 1]]:
+                if groupStart[candidate] < 0 and \
+                        np.all(np.bitwise_count(hashInts[members] ^ hashInts[candidate]) <= maxDistance):
+                    groupStart[candidate] = start
+                    members.append(candidate)
+        groupStart = np.where(groupStart < 0, hashIndex, groupStart)
+        labels = {hashValue: uniqueHashes[start] for hashValue, start in zip(uniqueHashes, groupStart)}
+
+    return [labels[hashValue] if valid else hashValue for hashValue, valid in zip(hashValues, isHash)]
+
+
+def getSimilarImages(tablesPath, processedDataPath, maxDistance=5):
     """
     Identify and store images with similar perceptual hashes (pHashes) in a database and CSV.
 
-    This function analyzes the `pHashes` table in the SQLite database to detect images that
-    share the same perceptual hash, indicating potential visual similarity. It creates a new
-    `similarImages` SQL table, reads it into a pandas DataFrame, and exports the results to
-    a CSV file in the specified processed data folder.
+    This function analyzes the `pHashes` table in the SQLite database to detect images with
+    perceptual hashes that differ in at most `maxDistance` bits, indicating potential visual
+    similarity. It creates a new `similarImages` SQL table and exports the same results to a
+    CSV file in the specified processed data folder.
 
     Parameters
     ----------
@@ -1034,23 +1880,28 @@ def getSimilarImages(tablesPath, processedDataPath):
         Path to the SQLite database file containing the initialHashes and pHashes table.
     processedDataPath : str
         Path to the folder where the resulting CSV of similar images will be saved.
+    maxDistance : int, optional
+        Maximum Hamming distance between two pHashes for the images to be considered
+        similar. Default is 5; 0 only matches identical pHashes.
 
     Returns
     -------
     pandas.DataFrame
         DataFrame containing the similar images, including:
         - `hashType`: type of hash used ('aHash or pHash')
-        - `hashValue`: the perceptual hash value
+        - `hashValue`: the perceptual hash value, for pHashes the smallest pHash of the group
         - `filePath`: path to the image file
 
     Notes
     -----
     - The function drops and recreates the `similarImages` table each time it is run.
-    - Only images with duplicate pHashes are considered as similar.
+    - pHashes are grouped with `_groupSimilarHashes`: the pHashes of the images in a group
+      differ pairwise in at most `maxDistance` bits.
+    - When falling back to aHashes, only images with duplicate aHashes are considered as similar.
     - The CSV file is saved as `similarImages.csv` in `processedDataPath`.
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
 
     print('\n######################   Obtaining similar images   ######################')
@@ -1061,20 +1912,17 @@ def getSimilarImages(tablesPath, processedDataPath):
     pHashCount = pd.read_sql("SELECT COUNT(*) as cnt FROM pHashes", connection)['cnt'][0]
 
     if pHashCount > 0:
-        # Use pHash
-        querySimilarImages = """
-        DROP TABLE IF EXISTS similarImages;
-        CREATE TABLE similarImages AS
-        SELECT 'pHash' as hashType, pHash as hashValue, filePath
-        FROM pHashes
-        WHERE pHash IN (
-            SELECT pHash
-            FROM pHashes
-            GROUP BY pHash
-            HAVING COUNT(*) > 1
-        );
-        """
+        # Use pHash, grouping the hashes within maxDistance of each other.
         print("[INFO] Using pHash table for similarity detection.")
+        pHashesDF = pd.read_sql("SELECT filePath, pHash FROM pHashes", connection)
+        pHashesDF['hashValue'] = _groupSimilarHashes(pHashesDF['pHash'].tolist(), maxDistance=maxDistance)
+        pHashesDF = pHashesDF[pHashesDF['hashValue'].duplicated(keep=False)]
+        pHashesDF.insert(0, 'hashType', 'pHash')
+
+        similarImagesDF = pHashesDF[['hashType', 'hashValue', 'filePath']].sort_values(['hashValue', 'filePath'])
+        bulkReplaceTable(connection, 'similarImages', similarImagesDF,
+                         columnTypes={'hashType': 'TEXT', 'hashValue': 'TEXT', 'filePath': 'TEXT'})
+        similarImagesDF = similarImagesDF.reset_index(drop=True)
     else:
         # Fallback to aHash from initialHashes
         querySimilarImages = """
@@ -1091,19 +1939,18 @@ def getSimilarImages(tablesPath, processedDataPath):
         """
         print("[INFO] pHashes table empty. Falling back to aHash from initialHashes.")
 
-    # Executing the query to drop and create the table.
-    cursor.executescript(querySimilarImages)
-    connection.commit()
+        # Executing the query to drop and create the table.
+        cursor.executescript(querySimilarImages)
+        connection.commit()
+        # Reading the table into a pandas DataFrame.
+        similarImagesDF = pd.read_sql("SELECT * FROM similarImages", connection)
     print('[√] Image hashes analyzed successfully!')
-    # Reading the table into a pandas DataFrame.
-    pHashSimilarImagesDF = pd.read_sql("SELECT * FROM similarImages", connection)
-    
-    # Saving the tables as CSV.
-    pHashSimilarImagesDF =\
-    pHashSimilarImagesDF.to_csv(os.path.join(processedDataPath, 'similarImages.csv'), index=False)
+
+    # Saving the table as CSV, the pHash results are written from the DataFrame they were stored from.
+    similarImagesDF.to_csv(os.path.join(processedDataPath, 'similarImages.csv'), index=False)
     connection.close() 
 
-    return pHashSimilarImagesDF
+    return similarImagesDF
 
 
 def getSimilarImagesRanked(tablesPath, processedDataPath):
@@ -1147,7 +1994,7 @@ def getSimilarImagesRanked(tablesPath, processedDataPath):
     - The CSV file is saved as `similarImagesRanked.csv` in `processedDataPath`.
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
     print('\n[START] Ranking similar images.')
     # Create a table 'similarImagesRanked' to identify the best representative image 
@@ -1227,7 +2074,7 @@ def getSimilarImagesRanked(tablesPath, processedDataPath):
     similarImagesRankedDF = pd.read_sql("SELECT * FROM similarImagesRanked", con=connection)
    
     # Saving the DataFrame to a CSV file.
-    similarImagesRankedDF = similarImagesRankedDF.to_csv(os.path.join(processedDataPath, 'similarImagesRanked.csv'), index=False)
+    similarImagesRankedDF.to_csv(os.path.join(processedDataPath, 'similarImagesRanked.csv'), index=False)
     
     # Committing the changes and closing the connection.
     connection.commit()
@@ -1236,13 +2083,13 @@ def getSimilarImagesRanked(tablesPath, processedDataPath):
     return similarImagesRankedDF
 
     
-def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesRanked, pathToSimilarImagesMatchedMapped):
+def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, pathToSimilarImagesMatchedMapped):
     """
     Map ranked similar images to MaisFlexis records and export the results.
 
-    This function loads ranked similar images and MaisFlexis metadata, extracts filenames, 
-    performs SQL joins to match images with records, adds a mapping status column, and 
-    saves the final mapped results to an Excel file.
+    This function loads the MaisFlexis metadata, performs SQL joins to match the images in
+    the `similarImagesRanked` table with records based on their filenames, adds a mapping
+    status column, and saves the final mapped results to an Excel file.
 
     Parameters
     ----------
@@ -1250,15 +2097,14 @@ def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesR
         Path to the SQLite database file used for temporary storage and SQL operations.
     rawDataRecords : str
         Path to the CSV file containing MaisFlexis record metadata.
-    similarImagesRanked : str
-        Path to the CSV file containing ranked similar image information.
     pathToSimilarImagesMatchedMapped : str
         Path to the Excel file where the mapped results will be saved.
 
     Returns
     -------
-    pandas.DataFrame
-        DataFrame containing mapped and unmapped similar images, including:
+    None
+        The mapped and unmapped similar images are stored in the `mappedSimilarImages`
+        table and written to Excel, including:
         - MaisFlexis record fields (ID, CODE, NUMMER, etc.)
         - Image fields (filePath, hashValue, hashType, resolution, unique colors, rank)
         - `Koppelingstatus`: Indicates whether the image is linked ("gekoppeld") or unlinked ("ongekoppeld")
@@ -1267,29 +2113,21 @@ def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesR
     Notes
     -----
     - Existing `mappedSimilarImages` table in the database will be replaced.
-    - Filename extraction assumes backslash (`\\`) separators in paths.
-    - The function saves the results using `utils.writeDfToExcelSheet` in a sheet named `similarImagesMapped`.
+    - File names are extracted from the paths in SQL with the `basename` function.
+    - The rows are streamed from the database to a new Excel file with `utils.writeRowsToExcelSheet`,
+      in a sheet named `similarImagesMapped`.
     """
     # Connecting to the database in tablesPath.
-    connection = sqlite3.connect(database=tablesPath)
+    connection = connectToDatabase(tablesPath)
     cursor = connection.cursor()
 
     print('\n[START] Transforming similar records and preparing data for mapping.')
 
-    # Load the MaisFlexis and similar image data CSVs
-    rawDataRecordsDF = pd.read_csv(rawDataRecords, delimiter=',', low_memory=False)
-    # Normalize column name for join
-    rawDataRecordsDF.rename(columns={'BESTANDSNAAM': 'Bestandsnaam'}, inplace=True)
-    similarImagesRankedDF = pd.read_csv(similarImagesRanked)
-
-    # Extract filename from filePath in similarImagesRankedDF for joining
-    similarImagesRankedDF['Bestandsnaam'] = similarImagesRankedDF['filePath'].str.split('\\').str.get(-1)
-
-    # Save rawDataRecordsDF to SQL for join (replace existing table)
-    rawDataRecordsDF.to_sql(name='rawDataRecords', con=connection, if_exists='replace', index=False)
-
-    # similarImagesRankedDF already saved in your previous code, but safer to also save rawDataRecords here:
-    similarImagesRankedDF.to_sql(name='similarImagesRanked', con=connection, if_exists='replace', index=False)
+    # Load the MaisFlexis data CSV into SQL for the join. It is usually still loaded and
+    # unchanged from mapDuplicatesToConversionNames, in which case reading it is skipped.
+    # The similarImagesRanked table was already stored by getSimilarImagesRanked.
+    loadSourceTable(connection, 'rawDataRecords', rawDataRecords, _readRawDataRecords)
+    _indexMappingTables(connection)
 
     print('[√] Data loaded into the database.')
 
@@ -1306,7 +2144,7 @@ def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesR
     FROM 
         similarImagesRanked d
     LEFT JOIN 
-        rawDataRecords r ON d.Bestandsnaam = r.Bestandsnaam
+        rawDataRecords r ON basename(d.filePath) = r.Bestandsnaam
     LEFT JOIN
         conversionNames c ON r.ID = c.ID
     LEFT JOIN
@@ -1316,14 +2154,14 @@ def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesR
     cursor.executescript(mappedSimilarImagesQuery)
     connection.commit()
 
-    print('[√] SQL join completed. Loading results.')
-
-    # Load results from the database
-    mappedSimilarImagesDF = pd.read_sql("SELECT * FROM mappedSimilarImages", con=connection)
+    print('[√] SQL join completed. Saving results.')
 
-    # Save to CSV
-
-    utils.writeDfToExcelSheet(pathToSimilarImagesMatchedMapped, mappedSimilarImagesDF, sheet_name='similarImagesMapped')
+    # Streaming the results from the database into the Excel file.
+    mappedSimilarImagesCursor = connection.execute("SELECT * FROM mappedSimilarImages")
+    utils.writeRowsToExcelSheet(pathToSimilarImagesMatchedMapped,
+                                [column[0] for column in mappedSimilarImagesCursor.description],
+                                mappedSimilarImagesCursor,
+                                sheet_name='similarImagesMapped')
 
     # Close DB connection
     connection.close()
@@ -1331,10 +2169,8 @@ def mapSimilarImagesToConversionNames(tablesPath, rawDataRecords, similarImagesR
     print('[√] Similar images successfully mapped to MaisFlexis records!')
     print(f'Results saved to: {pathToSimilarImagesMatchedMapped}')
 
-    return mappedSimilarImagesDF
-
 
-def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped):
+def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped, verbose=False):
     """
     Compare similar images within the mapped dataset to identify duplicates and select the best image.
 
@@ -1348,6 +2184,9 @@ def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped):
         Path to the SQLite database containing the `mappedSimilarImages` table.
     pathToSimilarImagesMatchedMapped : str
         Path to the Excel file where the matched results will be saved.
+    verbose : bool, optional
+        If True, the best image and the matching files to remove are printed for every
+        group. Default is False.
 
     Returns
     -------
@@ -1367,7 +2206,7 @@ def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped):
     - The final results are saved using `utils.writeDfToExcelSheet`.
     """
     print(f"[INFO] Connecting to database: {tablesPath}")
-    conn = sqlite3.connect(tablesPath)
+    conn = connectToDatabase(tablesPath)
 
     print("[INFO] Loading data from 'mappedSimilarImages'...")
     df = pd.read_sql("SELECT * FROM mappedSimilarImages", conn)
@@ -1390,65 +2229,57 @@ def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped):
     print("[INFO] Stripping extensions from 'Bestandsnaam' column...")
     df['Bestandsnaam'] = df['Bestandsnaam'].str.split('.').str[0]
 
+    # The hash strings are factorized once, all grouping below is done on the integer codes.
+    df['hashCode'] = pd.factorize(df['hashValue'])[0]
+
     print("[INFO] Filtering for duplicate hash groups...")
     original_len = len(df)
-    df = df[df['hashValue'].duplicated(keep=False)]
+    # Rows without a hashValue get code -1 and do not form a group.
+    df = df[df['hashCode'] >= 0]
+    df = df[df['hashCode'].duplicated(keep=False)]
     print(f"[INFO] Reduced from {original_len} to {len(df)} rows with duplicate hashValues")
 
-    matched_rows = []
-    print("[INFO] Starting group-by 'hashValue' to find matched images...")
-
-    for i, (hash_val, group) in enumerate(df.groupby('hashValue'), start=1):
-        print(f"\n[GROUP {i}] hashValue = {hash_val} | {len(group)} images")
-
-        rank1 = group[group['rank'] == 1]
-        if rank1.empty:
-            print(" → [SKIP] No rank 1 image in this group")
-            continue
-
-        best = rank1.iloc[0]
-        best_name = best['Bestandsnaam']
-        best_image_path = best['filePath']
-
-        # Convert naar int of "niet van toepassing"
-        toegangsnummer = (
-            int(best['toegangsnummer']) if pd.notna(best.get('toegangsnummer')) else "niet van toepassing"
-        )
-        inventarisnummer = (
-            int(best['inventarisnummer']) if pd.notna(best.get('inventarisnummer')) else "niet van toepassing"
-        )
-
-        print(f" → Best image: {best_image_path} "
-              f"(Bestandsnaam: {best_name}, Toegangsnummer: {toegangsnummer}, Inventarisnummer: {inventarisnummer})")
-
-        # Prepare for matching
-        best_name_str = str(best_name) if pd.notna(best_name) else ''
-        images_to_remove_rows = group[
-            (group['Bestandsnaam'] != best_name) &
-            (
-                group['AANVRAAGNUMMER'].str.contains(best_name_str, na=False) |
-                group['NUMMERING_CONVERSIE'].str.contains(best_name_str, na=False)
-            )
-        ]
-
-        if not images_to_remove_rows.empty:
-            images_to_remove = ', '.join(images_to_remove_rows['filePath'].tolist())
-            print(f" → [MATCH] {len(images_to_remove_rows)} matching files to remove:")
-            print(images_to_remove_rows[['filePath']])
-        else:
-            images_to_remove = ''
-            print(" → [NO MATCH] Nothing matched AANVRAAGNUMMER or NUMMERING_CONVERSIE")
-
-        matched_rows.append({
-            'hashValue': hash_val,
-            'bestImage': best_image_path,
-            'imagesToRemove': images_to_remove,
-            'toegangsnummer': toegangsnummer,
-            'inventarisnummer': inventarisnummer
-        })
-
-    print(f"[INFO] Writing {len(matched_rows)} matched groups to Excel: {pathToSimilarImagesMatchedMapped}")
-    similarImagesMatchedDF = pd.DataFrame(matched_rows)
+    print("[INFO] Selecting the best image per 'hashValue' group...")
+    # The first image with rank 1 is the best image of its group, groups without one are skipped.
+    best = df[df['rank'] == 1].drop_duplicates('hashCode').sort_values('hashValue')
+    print(f"[INFO] Skipped {df['hashCode'].nunique() - len(best)} groups without a rank 1 image")
+
+    # Broadcasting the best image of each group to all of its rows.
+    group = df.merge(best[['hashCode', 'Bestandsnaam']].rename(columns={'Bestandsnaam': 'bestName'}),
+                     on='hashCode', how='inner')
+
+    # Images match the best image when its name is part of their AANVRAAGNUMMER or NUMMERING_CONVERSIE.
+    bestNames = group['bestName'].fillna('').astype(str).tolist()
+    containsBestName = np.array([
+        (isinstance(aanvraagnummer, str) and bestName in aanvraagnummer) or
+        (isinstance(nummeringConversie, str) and bestName in nummeringConversie)
+        for aanvraagnummer, nummeringConversie, bestName in zip(group['AANVRAAGNUMMER'],
+                                                                group['NUMMERING_CONVERSIE'],
+                                                                bestNames)
+    ], dtype=bool)
+    imagesToRemoveRows = group[(group['Bestandsnaam'] != group['bestName']) & containsBestName]
+    imagesToRemove = imagesToRemoveRows.groupby('hashCode', sort=False)['filePath'].agg(', '.join)
+    print(f"[INFO] Found {len(imagesToRemoveRows)} matching files to remove in {len(imagesToRemove)} groups")
+
+    # Convert naar int of "niet van toepassing"
+    def toNumberOrNotApplicable(column):
+        return column.astype(object).where(column.notna(), "niet van toepassing")
+
+    similarImagesMatchedDF = pd.DataFrame({
+        'hashValue': best['hashValue'],
+        'bestImage': best['filePath'],
+        'imagesToRemove': best['hashCode'].map(imagesToRemove).fillna(''),
+        'toegangsnummer': toNumberOrNotApplicable(best['toegangsnummer']),
+        'inventarisnummer': toNumberOrNotApplicable(best['inventarisnummer'])
+    }).reset_index(drop=True)
+
+    # The details per group are printed at once instead of line by line.
+    if verbose:
+        print('\n'.join(f" → [GROUP] hashValue = {row.hashValue} | Best image: {row.bestImage} | "
+                         f"To remove: {row.imagesToRemove or '-'}"
+                         for row in similarImagesMatchedDF.itertuples(index=False)))
+
+    print(f"[INFO] Writing {len(similarImagesMatchedDF)} matched groups to Excel: {pathToSimilarImagesMatchedMapped}")
     utils.writeDfToExcelSheet(
         pathToSimilarImagesMatchedMapped,
         similarImagesMatchedDF,
@@ -1459,7 +2290,7 @@ def compareSimilarImages(tablesPath, pathToSimilarImagesMatchedMapped):
     return similarImagesMatchedDF
 
 
-def compareExactDuplicates(tablesPath, pathToDescriptionData, pathToExactDuplicatesMatchedMapped):
+def compareExactDuplicates(tablesPath, pathToDescriptionData, pathToExactDuplicatesMatchedMapped, verbose=False):
     """
     Identify exact duplicate images, join with description data, and determine which images to keep or remove.
 
@@ -1475,6 +2306,9 @@ def compareExactDuplicates(tablesPath, pathToDescriptionData, pathToExactDuplica
         Path to the Excel file containing description data to join with duplicates.
     pathToExactDuplicatesMatchedMapped : str
         Path to the Excel file where the matched exact duplicates results will be saved.
+    verbose : bool, optional
+        If True, the best image and the images to remove are printed for every group.
+        Default is False.
 
     Returns
     -------
@@ -1488,16 +2322,20 @@ def compareExactDuplicates(tablesPath, pathToDescriptionData, pathToExactDuplica
     -----
     - If no exact duplicates are found, an empty DataFrame is returned and saved.
     - Requires the `ID` column to exist in both the database and description Excel file.
+    - The description data is only read again when the Excel file changed since it was
+      last loaded, see `loadSourceTable`.
     - Assumes the first row of each hash group is the preferred image to keep.
+    - The groups are formed in SQL with `ROW_NUMBER()` and `GROUP_CONCAT`, so the joined
+      table is never loaded into a DataFrame.
     """
 
     print(f"[INFO] Connecting to database: {tablesPath}")
-    connection = sqlite3.connect(tablesPath)
+    connection = connectToDatabase(tablesPath)
 
-    # Load description data (Excel) into SQLite table
+    # Load description data (Excel) into SQLite table, unless it is unchanged since the last run.
     print(f"[INFO] Loading description data from: {pathToDescriptionData}")
-    maisFlexisDescriptionsDF = pd.read_excel(pathToDescriptionData, engine="openpyxl")
-    maisFlexisDescriptionsDF.to_sql('descriptionData', connection, if_exists='replace', index=False)
+    if not loadSourceTable(connection, 'descriptionData', pathToDescriptionData, utils.readExcel):
+        print("[INFO] Description data unchanged, reusing the existing 'descriptionData' table.")
 
     # Create joined table with matched duplicates and description data
     cursor = connection.cursor()
@@ -1507,52 +2345,61 @@ def compareExactDuplicates(tablesPath, pathToDescriptionData, pathToExactDuplica
     SELECT m.*, d.*
     FROM mappedDuplicates m
     LEFT JOIN descriptionData d ON m.ID = d.ID;
+
+    -- The index holds the rows in (hashValue, rowid) order, so the window below reads them without sorting.
+    CREATE INDEX ix_exactDuplicateImagesMatched_hashValue ON exactDuplicateImagesMatched(hashValue);
     """
     cursor.executescript(create_table_sql)
     connection.commit()
     print("[INFO] Loaded matched exact duplicates with descriptions from DB.")
 
-    exactDuplicatesMatchedDF = pd.read_sql("SELECT * FROM exactDuplicateImagesMatched", con=connection)
+    # Selecting the best image per hashValue group in SQL: the first row of each group
+    # (in table order) is kept, all other rows of the group are concatenated as images to remove.
+    # GROUP_CONCAT only guarantees its order with an ORDER BY clause, which needs SQLite 3.44.
+    # Older versions concatenate the rows in the order the ordered subquery returns them.
+    # The subquery is ordered by (hashValue, rowid), the order of the hashValue index, so
+    # neither the window nor that ORDER BY needs a sort.
+    if sqlite3.sqlite_version_info >= (3, 44, 0):
+        imagesToRemoveSql = "GROUP_CONCAT(CASE WHEN rowNumber > 1 THEN filePath END, ', ' ORDER BY rowNumber)"
+    else:
+        imagesToRemoveSql = "GROUP_CONCAT(CASE WHEN rowNumber > 1 THEN filePath END, ', ')"
+    bestImagesQuery = f"""
+    SELECT
+        hashValue,
+        MAX(CASE WHEN rowNumber = 1 THEN filePath END) AS bestImage,
+        COALESCE({imagesToRemoveSql}, '') AS imagesToRemove
+    FROM (
+        SELECT
+            hashValue,
+            filePath,
+            ROW_NUMBER() OVER (PARTITION BY hashValue ORDER BY rowid) AS rowNumber
+        FROM exactDuplicateImagesMatched
+        WHERE hashValue IS NOT NULL
+        ORDER BY hashValue, rowid
+    )
+    GROUP BY hashValue
+    ORDER BY hashValue;
+    """
+    resultDF = pd.read_sql(bestImagesQuery, con=connection)
     connection.close()
 
-    if exactDuplicatesMatchedDF.empty:
+    if resultDF.empty:
         print("[WARNING] No matched exact duplicates found!")
         # Save empty DataFrame to Excel for consistency
-        utils.similarImagesMatchedDF(pathToExactDuplicatesMatchedMapped, exactDuplicatesMatchedDF, sheet_name='exactDuplicatesMatched')
-        return exactDuplicatesMatchedDF
+        utils.writeDfToExcelSheet(pathToExactDuplicatesMatchedMapped, resultDF, sheet_name='exactDuplicatesMatched')
+        return resultDF
 
-    print(f"[INFO] Processing {len(exactDuplicatesMatchedDF)} matched exact duplicates...")
-
-    # We expect 'hashValue', 'filePath', 'Bestandsnaam' columns to exist from mappedDuplicates
-    if 'hashValue' not in exactDuplicatesMatchedDF.columns or 'filePath' not in exactDuplicatesMatchedDF.columns:
-        raise KeyError("[ERROR] 'hashValue' and/or 'filePath' columns are missing in the exact duplicates data.")
-
-    results = []
-
-    # Group by hashValue (duplicates)
-    for hash_val, group in exactDuplicatesMatchedDF.groupby('hashValue'):
-        # Pick arbitrary one as best image (e.g., first row)
-        best_row = group.iloc[0]
-        best_image = best_row['filePath']
-
-        # All others are to remove
-        images_to_remove_list = group['filePath'].iloc[1:].tolist()
-        images_to_remove = ', '.join(images_to_remove_list)
-
-        print(f"\n[GROUP] hashValue={hash_val} | total={len(group)} images")
-        print(f" → Best image: {best_image}")
-        if images_to_remove_list:
-            print(f" → Images to remove ({len(images_to_remove_list)}): {images_to_remove}")
-        else:
-            print(" → No images to remove in this group (only one image)")
+    print(f"[INFO] Selected the best image for {len(resultDF)} exact duplicate groups")
 
-        results.append({
-            'hashValue': hash_val,
-            'bestImage': best_image,
-            'imagesToRemove': images_to_remove
-        })
+    if verbose:
+        for row in resultDF.itertuples(index=False):
+            print(f"\n[GROUP] hashValue={row.hashValue}")
+            print(f" → Best image: {row.bestImage}")
+            if row.imagesToRemove:
+                print(f" → Images to remove: {row.imagesToRemove}")
+            else:
+                print(" → No images to remove in this group (only one image)")
 
-    resultDF = pd.DataFrame(results)
     utils.writeDfToExcelSheet(pathToExactDuplicatesMatchedMapped, resultDF, sheet_name='exactDuplicatesMatched')
     print(f"[√] Done. Output saved to: {pathToExactDuplicatesMatchedMapped}")
 
@@ -6,8 +6,7 @@ def main():
     
     #### Program Initialization and Setup #### 
 
-    art = utils.asciiArt()
-    print(art['logo'], art['title'])
+    utils.printArt('logo', 'title')
     
     folderPaths, filePaths = utils.createPaths()
     directories, mapping, exifToolPath = setup.getUserInputs(folderPaths)
@@ -64,7 +63,6 @@ def main():
         # Mapping the images to MaisFlexis Records
         imageCompare.mapDuplicatesToConversionNames(tablesPath=filePaths['tables'], 
                                                     rawDataRecords=filePaths['rawDataRecords'],
-                                                    exactDuplicates=filePaths['exactDuplicates'],
                                                     pathToExactDuplicatesMatchedMapped=filePaths['exactDuplicatesMatchedMapped'])
                 
         
@@ -74,7 +72,6 @@ def main():
         
         imageCompare.mapSimilarImagesToConversionNames(tablesPath=filePaths['tables'], 
                                                       rawDataRecords=filePaths['rawDataRecords'],
-                                                      similarImagesRanked=filePaths['similarImagesRanked'],
                                                       pathToSimilarImagesMatchedMapped=filePaths['similarImagesMatchedMapped'])
         
 
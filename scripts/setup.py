@@ -3,12 +3,52 @@ import subprocess
 import sys
 import platform
 import venv
+import json
+import argparse
+import shutil
 from utils import createPaths, ensureDirectoriesExist
 
+def getEnvPythonExecutable(envPath):
+    """
+    Return the path to the Python executable of a virtual environment.
+
+    Parameters:
+    envPath (str): Path to the virtual environment
+
+    Returns:
+    str: The path to the Python executable in the virtual environment
+    """
+    if os.name == 'nt':
+        return os.path.join(envPath, 'Scripts', 'python.exe')
+    return os.path.join(envPath, 'bin', 'python')
+
+def isUsableVirtualEnv(envPath):
+    """
+    Check whether a working virtual environment already exists at the given path.
+
+    Parameters:
+    envPath (str): Path to the virtual environment
+
+    Returns:
+    bool: True if the Python executable of the environment exists and runs
+    """
+    pythonExecutable = getEnvPythonExecutable(envPath)
+    if not os.path.isfile(pythonExecutable):
+        return False
+    try:
+        subprocess.run([pythonExecutable, '--version'], check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return True
+
 def createVirtualEnv(envName):
     """
     Create a Python virtual environment with the given name.
 
+    A working environment that already exists at that location is reused instead.
+    When uv is available on the PATH, the environment is created with `uv venv`, which
+    is much faster than the venv module, in particular on Windows.
+
     Parameters:
     envName (str): The name of the virtual environment
 
@@ -18,45 +58,84 @@ def createVirtualEnv(envName):
     currentPath = os.getcwd()
     relativeEnvPath = os.path.join(currentPath, '..', envName)
     envPath = os.path.abspath(relativeEnvPath)
-    venv.create(envPath, with_pip=True)
+    if isUsableVirtualEnv(envPath):
+        print(f"Using the existing virtual environment in: {envPath}")
+        return envPath
+    uvExecutable = shutil.which('uv')
+    if uvExecutable:
+        # '--seed' also installs pip, so the environment can be used without uv as well.
+        subprocess.check_call([uvExecutable, 'venv', '--seed', envPath])
+    else:
+        venv.create(envPath, with_pip=True, symlinks=(os.name != 'nt'))
     print(f"Virtual environment created in: {envPath}")
     return envPath
 
-def installRequirements(paths, envPath=None):
+def installRequirements(paths, envPath=None, verbose=False):
     """
     Install Python packages listed in a requirements.txt file.
 
+    When uv is available on the PATH, the packages are installed with `uv pip install`,
+    which resolves and installs them in parallel. Otherwise pip is used. The installer
+    runs quietly, its output is only shown when the installation fails.
+
     Parameters:
     paths (dict): A dictionary containing the path to the requirements.txt
     envPath (str, optional): Path to the virtual environment; installs in current environment if None
+    verbose (bool, optional): Show the full output of the installer; False by default
 
     Returns:
     None
     """
     if envPath:
-        pythonExecutable = os.path.join(envPath, 'Scripts', 'python.exe') if os.name == 'nt' else os.path.join(envPath, 'bin', 'python')
+        pythonExecutable = getEnvPythonExecutable(envPath)
         print(f"Using Python executable: {pythonExecutable}")
-        subprocess.check_call([pythonExecutable, '-m', 'pip', 'install', '-r', paths["requirements"]])
     else:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', paths["requirements"]])
+        pythonExecutable = sys.executable
+
+    quietOptions = [] if verbose else ['-q']
+    uvExecutable = shutil.which('uv')
+    if uvExecutable:
+        command = [uvExecutable, 'pip', 'install'] + quietOptions + ['--python', pythonExecutable, '-r', paths["requirements"]]
+    else:
+        # Wheels are preferred over source builds, and the installed files are not compiled to bytecode
+        # up front; Python compiles the modules that are actually imported on first use.
+        command = [pythonExecutable, '-m', 'pip', 'install'] + quietOptions +\
+                  ['--disable-pip-version-check', '--no-color', '--no-compile', '--prefer-binary',
+                   '-r', paths["requirements"]]
+
+    print('[START] Installing requirements.')
+    try:
+        subprocess.run(command, check=True, capture_output=not verbose, text=True)
+    except subprocess.CalledProcessError as error:
+        # The captured output is shown to explain the failure.
+        if not verbose:
+            print(error.stdout, error.stderr, sep='\n')
+        raise
+    print('[√] Requirements installed succesfully!')
 
-def getEnvInputs(paths):
+def getEnvInputs(paths, argv=None):
     """
     Prompt the user to choose between installing requirements in the current 
     environment or creating a new virtual environment. Calls the appropriate 
     functions based on the user's choice.
 
+    The choices given on the command line (--env, --env-name) are not prompted for.
+
     Parameters:
     paths (dict): A dictionary containing the path to the requirements.txt
+    argv (list, optional): The command line arguments; sys.argv is used if None
 
     Returns:
     None
     """
-    envChoice = input("Do you want to install requirements in the current environment or a new virtual environment? (current/new): ").strip().lower()
+    arguments = parseArguments(argv)
+    envChoice = arguments.env
+    if envChoice is None:
+        envChoice = input("Do you want to install requirements in the current environment or a new virtual environment? (current/new): ").strip().lower()
 
     while True:
         if envChoice == 'new':
-            envName = input("Enter the name for the new virtual environment: ").strip()
+            envName = arguments.envName or input("Enter the name for the new virtual environment: ").strip()
             envPath = createVirtualEnv(envName)
             installRequirements(paths=paths, envPath=envPath)
             break
@@ -67,15 +146,113 @@ def getEnvInputs(paths):
             print('Invalid choice. Please enter "current" or "new".')
             envChoice = input("Do you want to install requirements in the current environment or a new virtual environment? (current/new): ").strip().lower()
 
-def getUserInputs(paths):
+# File in which the answers of the last run are stored, to prefill the prompts of the next run.
+cachedInputsPath = os.path.join(os.path.expanduser('~'), '.image_compare.json')
+
+# Check per cached input, so a cache file that was edited by hand cannot pass on values of the wrong type.
+_cachedInputChecks = {
+    'directories': lambda value: isinstance(value, list) and all(isinstance(directory, str) for directory in value),
+    'mapping': lambda value: value in ('Y', 'N'),
+    'exifToolPath': lambda value: isinstance(value, str),
+}
+
+def loadCachedInputs():
+    """
+    Load the user inputs of the previous run.
+
+    Returns:
+    dict: The cached 'directories', 'mapping' and 'exifToolPath', or an empty dict if there are none.
+    Inputs that are not valid are left out.
+    """
+    try:
+        with open(cachedInputsPath, encoding='utf-8') as cacheFile:
+            cachedInputs = json.load(cacheFile)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cachedInputs, dict):
+        return {}
+    return {name: value for name, value in cachedInputs.items()
+            if name in _cachedInputChecks and _cachedInputChecks[name](value)}
+
+def saveCachedInputs(directories, mapping, exifToolPath):
+    """
+    Store the user inputs, so they can be reused as defaults in the next run.
+
+    Parameters:
+    directories (list): The image directories
+    mapping (str): The mapping choice ('Y'/'N')
+    exifToolPath (str): The ExifTool path
+
+    Returns:
+    None
+    """
+    try:
+        with open(cachedInputsPath, 'w', encoding='utf-8') as cacheFile:
+            json.dump({'directories': directories, 'mapping': mapping, 'exifToolPath': exifToolPath}, cacheFile, indent=4)
+    except OSError as e:
+        print(f'[INFO] Could not store the inputs for the next run: {e}')
+
+def parseArguments(argv=None):
+    """
+    Parse the command line arguments, with which the interactive prompts can be skipped.
+
+    Parameters:
+    argv (list, optional): The arguments to parse; sys.argv is used if None
+
+    Returns:
+    argparse.Namespace: The parsed 'directories', 'mapping', 'exiftool', 'nonInteractive',
+    'env' and 'envName' arguments
+    """
+    parser = argparse.ArgumentParser(description='Find exact duplicate and similar images.')
+    parser.add_argument('--directories', '--images-dir', nargs='+', help='Directories with the images to be analysed.')
+    parser.add_argument('--mapping', type=str.upper, choices=('Y', 'N'),
+                        help='Whether the output is mapped to MaisFlexis records.')
+    parser.add_argument('--no-mapping', dest='mapping', action='store_const', const='N',
+                        help='Do not map the output to MaisFlexis records, same as --mapping N.')
+    parser.add_argument('--exiftool', '--exiftool-path', help='Path to the ExifTool executable.')
+    parser.add_argument('--non-interactive', dest='nonInteractive', action='store_true',
+                        help='Use the inputs of the previous run for anything not given, instead of prompting.')
+    parser.add_argument('--env', type=str.lower, choices=('current', 'new'),
+                        help='Install the requirements in the current or a new virtual environment (setup.py).')
+    parser.add_argument('--env-name', dest='envName',
+                        help='Name of the new virtual environment (setup.py).')
+    return parser.parse_args(argv)
+
+def resolveExifToolPath(exifToolPath):
+    """
+    Verify that the ExifTool executable exists, given its path, its directory or its name on the PATH.
+
+    Parameters:
+    exifToolPath (str): Path to the ExifTool executable or the directory it is installed in
+
+    Returns:
+    str: The path to the ExifTool executable, or None if it cannot be found
+    """
+    if not exifToolPath:
+        return None
+    candidates = [exifToolPath]
+    if os.path.isdir(exifToolPath):
+        candidates = [os.path.join(exifToolPath, name) for name in ('exiftool', 'exiftool.exe')]
+    for candidate in candidates:
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return shutil.which(exifToolPath)
+
+def getUserInputs(paths, argv=None):
     """
     Prompt the user for input directories, mapping choice, and ExifTool path.
 
     For non-Windows systems, the user is asked for the ExifTool installation directory.
     For Windows, the default ExifTool path from 'paths' is used.
 
+    Inputs given on the command line (--directories, --mapping, --exiftool) are not prompted for.
+    The prompts are prefilled with the answers of the previous run, which are used without
+    prompting when --non-interactive is given. The answers are stored for the next run.
+    The ExifTool path is verified with `resolveExifToolPath`, and asked for again when it is not found.
+
     Parameters:
     paths (dict): A dictionary containing paths, including default ExifTool path for Windows
+    argv (list, optional): The command line arguments; sys.argv is used if None
 
     Returns:
     tuple: A tuple containing the list of image directories, mapping choice ('Y'/'N'), and ExifTool path
@@ -83,6 +260,57 @@ def getUserInputs(paths):
     print('####################### Program Initialization ###########################')
     print('|------------------------------------------------------------------------|')
 
+    arguments = parseArguments(argv)
+    cachedInputs = loadCachedInputs()
+
+    directories = arguments.directories
+    mapping = arguments.mapping
+    exifToolPath = arguments.exiftool
+    if platform.system() == 'Windows' and exifToolPath is None:
+        exifToolPath = paths['exifToolWindows']
+
+    if arguments.nonInteractive:
+        directories = directories or cachedInputs.get('directories', [])
+        mapping = mapping or cachedInputs.get('mapping', 'N')
+        exifToolPath = exifToolPath or cachedInputs.get('exifToolPath')
+        if not directories or not exifToolPath:
+            sys.exit('[ERROR] No image directories or ExifTool path given or stored from a previous run.')
+
+    if directories is None:
+        directories = _promptDirectories(cachedInputs.get('directories', []))
+
+    if mapping is None:
+        mapping = _promptMapping(cachedInputs.get('mapping'))
+
+    if exifToolPath is None:
+        previousPath = cachedInputs.get('exifToolPath')
+        prompt = 'Enter the directory where the ExifTool is installed: '
+        if previousPath:
+            prompt = f'Enter the directory where the ExifTool is installed [{previousPath}]: '
+        exifToolPath = input(prompt).strip() or previousPath
+
+    # The ExifTool path is checked once here, instead of failing for every image later on.
+    verifiedExifToolPath = resolveExifToolPath(exifToolPath)
+    while verifiedExifToolPath is None:
+        if arguments.nonInteractive:
+            sys.exit(f'[ERROR] ExifTool was not found at: {exifToolPath}')
+        print(f'[INFO] ExifTool was not found at: {exifToolPath}')
+        exifToolPath = input('Enter the path to the ExifTool executable: ').strip()
+        verifiedExifToolPath = resolveExifToolPath(exifToolPath)
+    exifToolPath = verifiedExifToolPath
+
+    saveCachedInputs(directories, mapping, exifToolPath)
+
+    return directories, mapping, exifToolPath
+
+def _promptDirectories(previousDirectories):
+    """
+    Prompt the user for the image directories, pressing Enter right away reuses the previous ones.
+    """
+    if previousDirectories:
+        print(f'Previous images directories: {"; ".join(previousDirectories)}')
+        print('Press Enter right away to use these again.')
+
     directories = []
     while True:
         directory = input('Enter an images directory (or press Enter to finish): ').strip()
@@ -91,30 +319,32 @@ def getUserInputs(paths):
             break
         directories.append(directory)
 
+    return directories or list(previousDirectories)
+
+def _promptMapping(previousMapping=None):
+    """
+    Prompt the user for the mapping choice, pressing Enter reuses the previous choice.
+    """
+    default = f' [{previousMapping}]' if previousMapping else ''
     mapping = input(
-                    'Would you like the output to be mapped to MaisFlexis records? (Y/N)\n\n'
+                    f'Would you like the output to be mapped to MaisFlexis records? (Y/N){default}\n\n'
                     'IMPORTANT: This will only work if your mapping files are set up exactly like the fields in the following files:\n'
                     '- data\\raw\\Data_beeldbank_270\n'
                     '- data\\raw\\SCN_BEELDBANK_270\n\n'
-                    ).upper()
+                    ).strip().upper() or previousMapping
     
     while mapping not in ('Y', 'N'):
         print('Invalid choice. Please enter "Y" or "N".')
         mapping = input('Would you like the output to be mapped to MaisFlexis records? (Y/N) \n'
                     'IMPORTANT: This will only work if your mapping files are set up exactly like the fields in the following files: \n\
-                    - data\\raw\\Data_beeldbank_270\n - data\\raw\\SCN_BEELDBANK_270 \n\n')   
-        
-    if platform.system() != 'Windows':
-        exifToolPath = input('Enter the directory where the ExifTool is installed: ')
-    else:
-        exifToolPath = paths['exifToolWindows']
+                    - data\\raw\\Data_beeldbank_270\n - data\\raw\\SCN_BEELDBANK_270 \n\n').strip().upper()
 
-    return directories, mapping, exifToolPath
+    return mapping
 
 def main():
-    paths = createPaths()
-    ensureDirectoriesExist(paths)
-    getEnvInputs(paths)
+    folderPaths, _ = createPaths()
+    ensureDirectoriesExist(folderPaths)
+    getEnvInputs(folderPaths)
 
 if __name__ == "__main__":
     main()
@@ -1,45 +1,62 @@
 import os
-from openpyxl import load_workbook
-import pandas as pd
+import sys
+import functools
+import types
 
+# pandas and openpyxl are imported in the functions that use them, so the paths and art can be
+# used (e.g. by setup.py) before the requirements are installed, without the import cost.
+
+# The project folder is the parent of the scripts folder, determined once when the module is imported.
+_projectDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The folder and file paths returned by `createPaths`, as (name, parts relative to the project folder).
+_folderPathSpec = (
+    ('requirements', ('requirements.txt',)),
+    ('rawData', ('data', 'raw')),
+    ('processedData', ('data', 'processed')),
+    ('scripts', ('scripts',)),
+    ('exifToolWindows', ('tools', 'exiftool-13.04_64', 'exiftool.exe')),
+)
+
+_filePathSpec = (
+    ('tables', ('data', 'images.db')),
+    ('maisFlexisRecords', ('data', 'raw', 'Data_beeldbank.xlsx')),
+    ('rawDataRecords', ('data', 'raw', 'SCN_BEELDBANK.csv')),
+    ('maisFlexisDescriptions', ('data', 'raw', 'Beeldcollecties.xlsx')),
+    ('conversionNames', ('data', 'processed', 'conversionNames.csv')),
+    ('exifData', ('data', 'processed', 'exifData.csv')),
+    ('exactDuplicates', ('data', 'processed', 'exactDuplicates.csv')),
+    ('similarImages', ('data', 'processed', 'similarImages.csv')),
+    ('similarImagesRanked', ('data', 'processed', 'similarImagesRanked.csv')),
+    ('exactDuplicatesMatchedMapped', ('data', 'processed', 'exactDuplicatesMatchedMapped.xlsx')),
+    ('similarImagesMatchedMapped', ('data', 'processed', 'similarImagesMatchedMapped.xlsx')),
+    ('hashPath', ('data', 'processed', 'imagesHash.csv')),
+)
+
+@functools.lru_cache(maxsize=1)
 def createPaths():
     """
     Create and return key project folder and file paths.
 
+    The paths are relative to the project folder (the parent of the `scripts` folder),
+    regardless of the current working directory, as listed in `_folderPathSpec` and
+    `_filePathSpec`. They are only built once per run, later calls return the same
+    mappings. These are read-only views, so the cached paths cannot be changed by a caller.
+
     Returns
     -------
-    folderPaths : dict
+    folderPaths : mapping
         Paths to important folders like raw data, processed data, scripts, and tools.
-    filePaths : dict
+    filePaths : mapping
         Paths to key files such as databases, Excel/CSV datasets, and processed outputs.
     """
-    currentPath = os.getcwd()
-    parentDir = os.path.dirname(currentPath)
-    folderPaths = {
-
-        'requirements': os.path.join(parentDir, 'requirements.txt'),
-        'rawData': os.path.join(parentDir, 'data', 'raw'),
-        'processedData': os.path.join(parentDir, 'data', 'processed'),
-        'scripts': os.path.join(parentDir, 'scripts'),
-        'exifToolWindows': os.path.join(parentDir, 'tools', 'exiftool-13.04_64', 'exiftool.exe')
-    }
-    
-    filePaths = {
-        'tables': os.path.join(parentDir, 'data', 'images.db'),
-        'maisFlexisRecords': os.path.join(folderPaths['rawData'], 'Data_beeldbank.xlsx'),
-        'rawDataRecords': os.path.join(folderPaths['rawData'], 'SCN_BEELDBANK.csv'),
-        'maisFlexisDescriptions' : os.path.join(folderPaths['rawData'], 'Beeldcollecties.xlsx'),
-        'conversionNames': os.path.join(folderPaths['processedData'], 'conversionNames.csv'),
-        'exifData': os.path.join(folderPaths['processedData'], 'exifData.csv'),
-        'exactDuplicates': os.path.join(folderPaths['processedData'], 'exactDuplicates.csv'),
-        'similarImages': os.path.join(folderPaths['processedData'], 'similarImages.csv'),
-        'similarImagesRanked': os.path.join(folderPaths['processedData'], 'similarImagesRanked.csv'),
-        'exactDuplicatesMatchedMapped': os.path.join(folderPaths['processedData'], 'exactDuplicatesMatchedMapped.xlsx'),
-        'similarImagesMatchedMapped': os.path.join(folderPaths['processedData'], 'similarImagesMatchedMapped.xlsx'),
-        'hashPath': os.path.join(folderPaths['processedData'], 'imagesHash.csv')
-    }
-
-    return folderPaths, filePaths
+    folderPaths = {name: os.path.join(_projectDir, *parts) for name, parts in _folderPathSpec}
+    filePaths = {name: os.path.join(_projectDir, *parts) for name, parts in _filePathSpec}
+
+    return types.MappingProxyType(folderPaths), types.MappingProxyType(filePaths)
+
+# Directories that are known to exist, so they are not checked again.
+_createdDirectories = set()
 
 def ensureDirectoriesExist(paths):
     """
@@ -62,42 +79,118 @@ def ensureDirectoriesExist(paths):
         This function modifies the filesystem by creating directories but does not return a value.
     """
     for path in [paths['rawData'], paths['processedData']]:
-        if not os.path.exists(path):
-            os.makedirs(path)
+        if path not in _createdDirectories:
+            os.makedirs(path, exist_ok=True)
+            _createdDirectories.add(path)
 
 
-def writeDfToExcelSheet(path, df, sheet_name):
-    """Appends a DataFrame to an existing Excel file or creates one."""
+def readExcel(path, **kwargs):
+    """
+    Read an Excel file into a DataFrame, using the fast calamine engine when available.
+
+    The calamine engine (from the `python-calamine` package) parses the workbook in
+    Rust and is considerably faster than openpyxl for large exports. When it is not
+    installed, the file is read with openpyxl instead.
+
+    Parameters
+    ----------
+    path : str
+        Path to the Excel file.
+    **kwargs
+        Additional keyword arguments passed on to `pandas.read_excel`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The contents of the (first) sheet of the Excel file.
+    """
+    import pandas as pd
+
     try:
-        # Try to load existing workbook
-        with pd.ExcelWriter(path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
-    except FileNotFoundError:
-        # If file doesn't exist yet, create it
-        with pd.ExcelWriter(path, engine='openpyxl', mode='w') as writer:
-            df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return pd.read_excel(path, engine='calamine', **kwargs)
+    except ImportError:
+        return pd.read_excel(path, engine='openpyxl', **kwargs)
 
 
-def asciiArt():
+def writeRowsToExcelSheet(path, columns, rows, sheet_name):
     """
-    Return ASCII art representations used in the image comparison tool.
+    Write rows to a new Excel file with a single sheet, streaming them to disk.
 
-    This function provides predefined ASCII art as a dictionary. The current keys include:
-    - 'logo': A large, decorative ASCII logo for display in the terminal.
-    - 'title': A title banner indicating the image comparison tool.
+    The workbook is created in openpyxl's write-only mode, so the rows (e.g. a
+    SQLite cursor) are written one at a time instead of being loaded into a
+    DataFrame first. An existing file at `path` is overwritten.
+
+    Parameters
+    ----------
+    path : str
+        Path to the Excel file to be created.
+    columns : list of str
+        Column names, written as the header row.
+    rows : iterable of tuple
+        The rows to be written.
+    sheet_name : str
+        Name of the sheet.
 
     Returns
     -------
-    dict of str
-        A dictionary containing ASCII art strings, keyed by descriptive names.
-        Example:
-            {
-                'logo': "<ASCII art logo>",
-                'title': "<ASCII art title banner>"
-            }
+    None
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_name)
+    worksheet.append(list(columns))
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+def writeDfToExcelSheet(path, df, sheet_name):
+    """
+    Append a DataFrame to an existing Excel file as a sheet, or create the file.
+
+    The rows are appended to the sheet as plain tuples with openpyxl, instead of
+    going through `DataFrame.to_excel`, which formats every cell separately. A
+    sheet with the same name in the existing file is replaced, at the same position.
+
+    Parameters
+    ----------
+    path : str
+        Path to the Excel file.
+    df : pandas.DataFrame
+        The data to be written, without its index.
+    sheet_name : str
+        Name of the sheet.
+
+    Returns
+    -------
+    None
     """
-    art = {
-        'logo': 
+    # Missing values are written as empty cells.
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+    if not os.path.exists(path):
+        # If file doesn't exist yet, it is streamed to a new file.
+        writeRowsToExcelSheet(path, df.columns, rows, sheet_name)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path)
+    sheetIndex = None
+    if sheet_name in workbook.sheetnames:
+        sheetIndex = workbook.sheetnames.index(sheet_name)
+        workbook.remove(workbook[sheet_name])
+    worksheet = workbook.create_sheet(title=sheet_name, index=sheetIndex)
+    worksheet.append(list(df.columns))
+    for row in rows:
+        worksheet.append(row)
+    workbook.save(path)
+
+
+# ASCII art used in the image comparison tool, see `asciiArt`.
+_art = types.MappingProxyType({
+    'logo': 
         """                                                   
  #######################@ %######################* 
  #######################@ @%####@@@@############## 
@@ -131,6 +224,45 @@ def asciiArt():
     ========== image comparison tool ==========
           
     """
-    }
+})
+
+
+def asciiArt():
+    """
+    Return ASCII art representations used in the image comparison tool.
 
-    return art    
\ No newline at end of file
+    This function provides predefined ASCII art, stored once in the module-level,
+    read-only `_art` mapping. The current keys include:
+    - 'logo': A large, decorative ASCII logo for display in the terminal.
+    - 'title': A title banner indicating the image comparison tool.
+
+    Returns
+    -------
+    mapping of str
+        A read-only mapping containing ASCII art strings, keyed by descriptive names.
+        Example:
+            {
+                'logo': "<ASCII art logo>",
+                'title': "<ASCII art title banner>"
+            }
+    """
+    return _art
+
+
+def printArt(*names):
+    """
+    Print ASCII art from `asciiArt` to the terminal with a single write.
+
+    The pieces of art are separated by a space and followed by a newline, like `print` does.
+
+    Parameters
+    ----------
+    *names : str
+        Keys of the art to be printed, e.g. 'logo' and 'title'.
+
+    Returns
+    -------
+    None
+    """
+    sys.stdout.write(' '.join(_art[name] for name in names) + '\n')
+    sys.stdout.flush()
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import imageCompare
+
+
+class TestGroupSimilarHashes(unittest.TestCase):
+
+    def testChainIsSplitAtMaxDistance(self):
+        # a and b differ in 5 bits, b and c in 5 bits, but a and c in 10 bits.
+        a, b, c = '0000000000000000', '000000000000001f', '00000000000003ff'
+        labels = imageCompare._groupSimilarHashes([c, b, a], maxDistance=5)
+        self.assertEqual(labels, [c, a, a])
+
+    def testGroupIsLabeledWithSmallestHash(self):
+        hashValues = ['00000000000000ff', '00000000000000fe', 'ffffffffffffffff', '00000000000000fc']
+        labels = imageCompare._groupSimilarHashes(hashValues, maxDistance=5)
+        self.assertEqual(labels, ['00000000000000fc'] * 2 + ['ffffffffffffffff', '00000000000000fc'])
+
+    def testInvalidHashesOnlyMatchThemselves(self):
+        hashValues = ['Error processing x', '0000000000000000', 'Error processing x']
+        self.assertEqual(imageCompare._groupSimilarHashes(hashValues), hashValues)
+
+
+if __name__ == '__main__':
+    unittest.main()